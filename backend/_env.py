@@ -0,0 +1,20 @@
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Project root directory (one level up from the backend package)
+project_root = Path(__file__).resolve().parents[1]
+
+_LOADED = False
+
+def ensure_env_loaded() -> None:
+    """Load the project root .env file once per process.
+    
+    Later calls are no-ops, so every module can call this at import time
+    without re-parsing the file. Variables already set in the environment
+    are not overridden.
+    """
+    global _LOADED
+    if _LOADED:
+        return
+    load_dotenv(project_root / '.env', override=False)
+    _LOADED = True
@@ -1,16 +1,32 @@
-from typing import Optional
+from functools import lru_cache
+from typing import Final, Optional
 from fastapi import HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
 class AIAssistant(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     assistant_name: str = "AI Assistant"
     assistant_location: str = "Cloud"
     purpose: str = "To assist with questions"
 
+# Frozen, so a single default instance can be shared by every User
+_DEFAULT_ASSISTANT = AIAssistant()
+
 class User(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     username: str
     email: Optional[str] = None
-    ai_assistant: AIAssistant = AIAssistant()
+    ai_assistant: AIAssistant = Field(default_factory=lambda: _DEFAULT_ASSISTANT)
+
+# Users are frozen, so one instance per username can be shared across requests
+_TEST_USER: Final[User] = User(username="test_user")
+
+@lru_cache(maxsize=4096)
+def _make_user(username: str) -> User:
+    """Build (once) the User for an authenticated username"""
+    return User(username=username)
 
 async def decode_token(token: str) -> dict:
     """Mock token decoder that treats any token as valid"""
@@ -20,14 +36,14 @@ async def get_current_user(token: str) -> User:
     """Get the current user from a token"""
     if token == "test":
         # Return mock user for testing
-        return User(username="test_user")
+        return _TEST_USER
     
     try:
         payload = await decode_token(token)
         username = payload.get("sub", "")
         if not username:
             raise HTTPException(status_code=401, detail="Invalid token")
-        return User(username=username)
+        return _make_user(username)
     except Exception as e:
         print(f"Error authenticating user: {str(e)}")
         raise HTTPException(status_code=401, detail="Invalid token") from e 
\ No newline at end of file
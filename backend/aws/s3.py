@@ -1,19 +1,86 @@
 import os
+import time
+import random
+import asyncio
+import threading
 import boto3
-from collections import defaultdict
-from dotenv import load_dotenv
-from typing import Dict, List, Optional
+import aioboto3
+import httpx
+from botocore.auth import S3SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote
+from dataclasses import dataclass
+from enum import Enum
+from backend._env import ensure_env_loaded
+from typing import Dict, Iterator, List, Optional, Tuple
 import logging
 
 # Set up logging
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-# Get the project root directory (two levels up from current file)
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 # Load environment variables from the root directory .env file
-load_dotenv(os.path.join(project_root, '.env'))
+ensure_env_loaded()
+
+# Number of concurrent GetObject requests when fetching a whole directory.
+# The boto3 connection pool is sized to match so workers never wait on a socket.
+MAX_FETCH_WORKERS = 64
+
+# Shared botocore config for the sync and async clients: a pool sized for
+# concurrent fetches, TCP keepalive so idle connections survive NAT, and
+# virtual-hosted addressing to avoid redirect hops.
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=MAX_FETCH_WORKERS,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=10,
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    s3={'use_accelerate_endpoint': False, 'addressing_style': 'virtual'}
+)
+
+# Retry policy for the signed direct GET, matching the botocore client's attempt
+# budget: throttling, 5xx and connection errors back off exponentially with jitter
+SIGNED_GET_MAX_ATTEMPTS = 5
+SIGNED_GET_RETRY_BASE_DELAY = 0.1
+SIGNED_GET_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Objects at least this large are downloaded as parallel byte ranges
+RANGED_FETCH_THRESHOLD = 16 * 1024 * 1024
+RANGED_FETCH_PART_SIZE = 8 * 1024 * 1024
+RANGED_FETCH_CONCURRENCY = 8
+
+# Upper bound on bytes held by the ETag content cache used by get_file_content
+CONTENT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Seconds a bucket listing is reused before S3 is paginated again
+LISTING_CACHE_TTL = 600
+
+class FetchStatus(Enum):
+    """Outcome of fetching a single object."""
+    OK = "ok"
+    ERROR = "error"
+
+
+@dataclass(frozen=True, slots=True)
+class FileFetch:
+    """Result of fetching one file from a directory.
+    
+    On success `content` holds the decoded text and `error` is None; on failure
+    `content` is None and `error` names the exception type.
+    """
+    key: str
+    status: FetchStatus
+    content: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status is FetchStatus.OK
+
 
 class S3Client:
     def __init__(self):
@@ -23,97 +90,184 @@ class S3Client:
             if not self.bucket_name:
                 raise ValueError("AWS_S3_BUCKET_NAME environment variable is not set")
             
+            self.region = os.environ.get("AWS_REGION", "us-east-1")
+            
             # Initialize the S3 client
             self.s3_client = boto3.client(
                 's3',
                 aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
                 aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
-                region_name=os.environ.get("AWS_REGION", "us-east-1")
+                region_name=self.region,
+                config=S3_CLIENT_CONFIG
             )
+            
+            # Plain HTTP client for the GetObject hot path; requests are SigV4-signed
+            # directly with botocore, skipping boto3's per-call model and event overhead.
+            # Falls back to the boto3 client when no credentials can be resolved.
+            self._credentials = boto3.Session(
+                aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
+                aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
+                region_name=self.region
+            ).get_credentials()
+            self._http = None
+            if self._credentials is not None:
+                self._http = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=MAX_FETCH_WORKERS,
+                        max_keepalive_connections=MAX_FETCH_WORKERS
+                    ),
+                    timeout=httpx.Timeout(10.0, connect=3.0)
+                )
+            
+            # Cache for list_files_by_directory so repeated lookups skip re-paginating the bucket
+            self._listing_cache = None
+            self._listing_ts = 0.0
+            self._listing_ttl = LISTING_CACHE_TTL
+            
+            # LRU cache of key -> (ETag, body) so unchanged files can be revalidated
+            # with a conditional GET instead of downloading the body again
+            self._etag_cache: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+            self._etag_cache_bytes = 0
+            self._etag_lock = threading.Lock()
             logger.info(f"S3 client initialized with bucket: {self.bucket_name}")
         except Exception as e:
             logger.error(f"Error initializing S3 client: {str(e)}")
             raise
 
+    def close(self) -> None:
+        """Close the shared HTTP client used for signed GETs."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
     def list_files_by_directory(self) -> Dict[str, List[str]]:
         """List all files in the S3 bucket, grouped by directory.
         Includes files in subdirectories, maintaining their full paths.
+        Results are cached for LISTING_CACHE_TTL seconds; call
+        invalidate_listing_cache() to force a fresh listing. Each call returns
+        its own copy, so callers may modify it without affecting the cache.
         
         Returns:
             Dict[str, List[str]]: A dictionary with directory names as keys and 
                                  lists of file paths as values.
         """
+        if self._listing_cache is not None and time.monotonic() - self._listing_ts < self._listing_ttl:
+            return {directory: list(keys) for directory, keys in self._listing_cache.items()}
+        
         try:
-            # Initialize a defaultdict to store files by directory
-            files_by_directory = defaultdict(list)
+            # Initialize a dict to store files by directory
+            files_by_directory = {}
             
             # List all objects in the bucket
             paginator = self.s3_client.get_paginator('list_objects_v2')
             pages = paginator.paginate(Bucket=self.bucket_name)
             
             # Process each object
+            add_to_directory = files_by_directory.setdefault
             for page in pages:
-                if 'Contents' in page:
-                    for obj in page['Contents']:
-                        key = obj['Key']
-                        
-                        # Skip if the object is a directory marker (ends with '/')
-                        if key.endswith('/'):
-                            continue
-                        
-                        # Determine the directory for this file
-                        parts = key.split('/')
-                        if len(parts) > 1:
-                            # File is in a subdirectory
-                            directory = parts[0]
-                            files_by_directory[directory].append(key)
-                        else:
-                            # File is in the root directory
-                            files_by_directory['root'].append(key)
+                for obj in page.get('Contents', ()):
+                    key = obj['Key']
+                    
+                    # Skip if the object is a directory marker (ends with '/')
+                    if key[-1:] == '/':
+                        continue
+                    
+                    # Files without a '/' live in the root directory
+                    head, sep, _ = key.partition('/')
+                    add_to_directory(head if sep else 'root', []).append(key)
             
             logger.info(f"Found files in {len(files_by_directory)} directories")
-            return dict(files_by_directory)
+            self._listing_cache = {directory: list(keys) for directory, keys in files_by_directory.items()}
+            self._listing_ts = time.monotonic()
+            return files_by_directory
         
         except Exception as e:
             logger.error(f"Error listing files by directory: {str(e)}")
             return {}
 
-    def get_files_content_by_directory(self, directory_name: str) -> List[str]:
-        """Retrieve the content of all files in a specific directory as a list of strings.
+    def _list_keys_with_prefix(self, prefix: str) -> List[str]:
+        """List the file keys under a prefix, letting S3 do the filtering.
+        
+        Args:
+            prefix (str): The key prefix to list, e.g. 'branfordcastle.com/'
+            
+        Returns:
+            List[str]: The matching file keys, excluding directory markers
+        """
+        keys = []
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for obj in page.get('Contents', ()):
+                key = obj['Key']
+                # Skip if the object is a directory marker (ends with '/')
+                if key[-1:] != '/':
+                    keys.append(key)
+        return keys
+
+    def count_keys_with_prefix(self, prefix: str) -> int:
+        """Count the files under a prefix without building a full bucket listing.
+        
+        Args:
+            prefix (str): The key prefix to count, e.g. 'branfordcastle.com/'
+            
+        Returns:
+            int: The number of matching file keys, excluding directory markers
+        """
+        count = 0
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            # KeyCount includes directory markers, so subtract those
+            markers = sum(1 for obj in page.get('Contents', ()) if obj['Key'][-1:] == '/')
+            count += page.get('KeyCount', 0) - markers
+        return count
+
+    def _directory_keys(self, directory_name: str) -> List[str]:
+        """List the file keys belonging to a top-level directory.
+        
+        Args:
+            directory_name (str): The directory name, or 'root' for top-level files
+            
+        Returns:
+            List[str]: The file keys in the directory
+        """
+        # Root-level files have no common prefix, so use the grouped listing
+        if directory_name == 'root':
+            return self.list_files_by_directory().get('root', [])
+        return self._list_keys_with_prefix(f"{directory_name}/")
+
+    def invalidate_listing_cache(self) -> None:
+        """Drop the cached bucket listing so the next call re-lists S3."""
+        self._listing_cache = None
+        self._listing_ts = 0.0
+
+    def get_files_content_by_directory(self, directory_name: str) -> List[FileFetch]:
+        """Retrieve the content of all files in a specific directory.
         Includes files in subdirectories.
         
         Args:
             directory_name (str): The name of the directory to retrieve files from
             
         Returns:
-            List[str]: A list of file contents as strings
+            List[FileFetch]: One result per file in listing order; check `.ok`
+                             before using `.content`
         """
         try:
             # Get files in the directory
-            files_by_dir = self.list_files_by_directory()
-            if directory_name not in files_by_dir:
+            file_paths = self._directory_keys(directory_name)
+            if not file_paths:
                 logger.warning(f"Directory '{directory_name}' not found in bucket")
                 return []
             
-            file_paths = files_by_dir[directory_name]
-            file_contents = []
+            file_contents = [None] * len(file_paths)
             
-            # Retrieve content for each file
-            for file_path in file_paths:
-                try:
-                    response = self.s3_client.get_object(
-                        Bucket=self.bucket_name,
-                        Key=file_path
-                    )
-                    
-                    # Read the file content
-                    content = response['Body'].read().decode('utf-8')
-                    file_contents.append(content)
-                    
-                except Exception as e:
-                    logger.error(f"Error reading file {file_path}: {str(e)}")
-                    # Add an empty string or error message for this file
-                    file_contents.append(f"Error reading file: {file_path}")
+            # Retrieve content for each file concurrently, keeping the listing order
+            with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+                futures = {
+                    executor.submit(self._fetch_one, file_path): idx
+                    for idx, file_path in enumerate(file_paths)
+                }
+                for future in as_completed(futures):
+                    file_contents[futures[future]] = future.result()
             
             logger.info(f"Retrieved content for {len(file_contents)} files from directory '{directory_name}'")
             return file_contents
@@ -122,39 +276,366 @@ class S3Client:
             logger.error(f"Error retrieving file contents for directory '{directory_name}': {str(e)}")
             return []
 
-    def get_file_content(self, file_path: str) -> Optional[str]:
-        """Retrieve the content of a specific file from S3.
+    def iter_files_content_by_directory(self, directory_name: str) -> Iterator[FileFetch]:
+        """Yield the content of each file in a directory one object at a time.
+        Unlike get_files_content_by_directory, only a single file's content is
+        held in memory at once, so large directories can be processed incrementally.
+        
+        Args:
+            directory_name (str): The name of the directory to retrieve files from
+            
+        Yields:
+            FileFetch: One result per file in listing order
+        """
+        try:
+            file_paths = self._directory_keys(directory_name)
+        except Exception as e:
+            logger.error(f"Error listing files for directory '{directory_name}': {str(e)}")
+            return
+        
+        if not file_paths:
+            logger.warning(f"Directory '{directory_name}' not found in bucket")
+            return
+        
+        for file_path in file_paths:
+            yield self._fetch_one(file_path)
+
+    def _fetch_one(self, file_path: str) -> FileFetch:
+        """Fetch and decode a single file for get_files_content_by_directory.
         
         Args:
             file_path (str): The path to the file in the S3 bucket
             
         Returns:
-            Optional[str]: The file content as a string, or None if an error occurs
+            FileFetch: The fetch result for the file
         """
         try:
+            if self._http is not None:
+                return FileFetch(file_path, FetchStatus.OK, self._signed_get(file_path).decode('utf-8', errors='replace'))
+            
             response = self.s3_client.get_object(
                 Bucket=self.bucket_name,
                 Key=file_path
             )
             
+            # Read the file content and release the connection back to the pool promptly
+            body = response['Body']
+            try:
+                content = body.read().decode('utf-8', errors='replace')
+            finally:
+                body.close()
+            return FileFetch(file_path, FetchStatus.OK, content)
+            
+        except Exception as e:
+            logger.error(f"Error reading file {file_path}: {str(e)}")
+            return FileFetch(file_path, FetchStatus.ERROR, error=type(e).__name__)
+
+    def _object_url(self, file_path: str) -> str:
+        """Build the HTTPS URL for an object, virtual-hosted where the bucket name allows."""
+        key = quote(file_path, safe='/~')
+        if '.' in self.bucket_name:
+            # Dotted bucket names do not match the S3 wildcard certificate
+            return f"https://s3.{self.region}.amazonaws.com/{self.bucket_name}/{key}"
+        return f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{key}"
+
+    def _signed_get(self, file_path: str) -> bytes:
+        """GET an object over the shared HTTP client with a SigV4-signed request.
+        Throttling, 5xx responses and connection errors are retried with
+        exponential backoff, like the boto3 client's retry config.
+        
+        Args:
+            file_path (str): The path to the file in the S3 bucket
+            
+        Returns:
+            bytes: The object body
+            
+        Raises:
+            httpx.HTTPStatusError: If S3 returns a non-2xx status
+            httpx.TransportError: If the connection fails on every attempt
+        """
+        url = self._object_url(file_path)
+        for attempt in range(1, SIGNED_GET_MAX_ATTEMPTS + 1):
+            # Sign each attempt so retries carry a fresh request timestamp
+            request = AWSRequest(method='GET', url=url)
+            S3SigV4Auth(self._credentials.get_frozen_credentials(), 's3', self.region).add_auth(request)
+            try:
+                response = self._http.get(url, headers=dict(request.headers.items()))
+                if response.status_code not in SIGNED_GET_RETRY_STATUSES or attempt == SIGNED_GET_MAX_ATTEMPTS:
+                    response.raise_for_status()
+                    return response.content
+                logger.warning(f"S3 returned {response.status_code} for {file_path}, retrying (attempt {attempt})")
+            except httpx.TransportError as e:
+                if attempt == SIGNED_GET_MAX_ATTEMPTS:
+                    raise
+                logger.warning(f"Connection error fetching {file_path}: {str(e)}, retrying (attempt {attempt})")
+            time.sleep(random.uniform(0, SIGNED_GET_RETRY_BASE_DELAY * 2 ** attempt))
+
+    def get_file_content_bytes(self, file_path: str) -> Optional[bytes]:
+        """Retrieve the raw bytes of a specific file from S3 without decoding.
+        Files read before are revalidated with If-None-Match, so an unchanged
+        file is served from the in-memory cache without transferring its body.
+        
+        Args:
+            file_path (str): The path to the file in the S3 bucket
+            
+        Returns:
+            Optional[bytes]: The file content as bytes, or None if an error occurs
+        """
+        with self._etag_lock:
+            cached = self._etag_cache.get(file_path)
+        
+        try:
+            request = {'Bucket': self.bucket_name, 'Key': file_path}
+            if cached is not None:
+                request['IfNoneMatch'] = cached[0]
+            
+            try:
+                response = self.s3_client.get_object(**request)
+            except ClientError as e:
+                if cached is not None and e.response.get('Error', {}).get('Code') in ('304', 'NotModified'):
+                    with self._etag_lock:
+                        if file_path in self._etag_cache:
+                            self._etag_cache.move_to_end(file_path)
+                    return cached[1]
+                raise
+            
             # Read the file content
-            content = response['Body'].read().decode('utf-8')
+            body = response['Body']
+            try:
+                content = body.read()
+            finally:
+                body.close()
+            
+            etag = response.get('ETag')
+            if etag:
+                self._cache_content(file_path, etag, content)
             return content
             
         except Exception as e:
             logger.error(f"Error retrieving content for file '{file_path}': {str(e)}")
             return None
 
+    def _cache_content(self, file_path: str, etag: str, content: bytes) -> None:
+        """Store a file body in the ETag cache, evicting least recently used entries."""
+        if len(content) > CONTENT_CACHE_MAX_BYTES:
+            return
+        with self._etag_lock:
+            previous = self._etag_cache.pop(file_path, None)
+            if previous is not None:
+                self._etag_cache_bytes -= len(previous[1])
+            self._etag_cache[file_path] = (etag, content)
+            self._etag_cache_bytes += len(content)
+            while self._etag_cache_bytes > CONTENT_CACHE_MAX_BYTES:
+                _, (_, evicted) = self._etag_cache.popitem(last=False)
+                self._etag_cache_bytes -= len(evicted)
+
+    def get_file_content(self, file_path: str) -> Optional[str]:
+        """Retrieve the content of a specific file from S3.
+        
+        Args:
+            file_path (str): The path to the file in the S3 bucket
+            
+        Returns:
+            Optional[str]: The file content as a string, or None if an error occurs
+        """
+        content = self.get_file_content_bytes(file_path)
+        if content is None:
+            return None
+        return content.decode('utf-8', errors='replace')
+
+    def get_file_content_ranged(
+        self,
+        file_path: str,
+        part_size: int = RANGED_FETCH_PART_SIZE,
+        concurrency: int = RANGED_FETCH_CONCURRENCY
+    ) -> Optional[str]:
+        """Retrieve a large file from S3 using parallel byte-range GETs.
+        Objects smaller than RANGED_FETCH_THRESHOLD use the single-request path.
+        
+        Args:
+            file_path (str): The path to the file in the S3 bucket
+            part_size (int): Size in bytes of each ranged request
+            concurrency (int): Maximum number of ranges fetched at once
+            
+        Returns:
+            Optional[str]: The file content as a string, or None if an error occurs
+        """
+        try:
+            head = self.s3_client.head_object(Bucket=self.bucket_name, Key=file_path)
+            size = head['ContentLength']
+            if size < RANGED_FETCH_THRESHOLD:
+                return self.get_file_content(file_path)
+            
+            # Each part is copied straight into its slice of a pre-sized buffer
+            buffer = bytearray(size)
+            view = memoryview(buffer)
+            
+            def fetch_range(start: int) -> None:
+                end = min(start + part_size, size) - 1
+                response = self.s3_client.get_object(
+                    Bucket=self.bucket_name,
+                    Key=file_path,
+                    Range=f"bytes={start}-{end}"
+                )
+                body = response['Body']
+                try:
+                    view[start:end + 1] = body.read()
+                finally:
+                    body.close()
+            
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                # list() re-raises the first failed part
+                list(executor.map(fetch_range, range(0, size, part_size)))
+            
+            return buffer.decode('utf-8', errors='replace')
+            
+        except Exception as e:
+            logger.error(f"Error retrieving ranged content for file '{file_path}': {str(e)}")
+            return None
+
 # Create a singleton instance
-s3_client = None
+s3_client: Optional[S3Client] = None
+_s3_lock = threading.Lock()
 
 def get_s3_client() -> S3Client:
     """Get or create the S3 client singleton instance.
+    Thread-safe: concurrent first calls construct only one client.
     
     Returns:
         S3Client: The S3 client instance
     """
     global s3_client
-    if s3_client is None:
-        s3_client = S3Client()
-    return s3_client
\ No newline at end of file
+    # Fast path once initialized, no lock needed
+    if s3_client is not None:
+        return s3_client
+    with _s3_lock:
+        if s3_client is None:
+            s3_client = S3Client()
+    return s3_client
+
+def close_s3_client() -> None:
+    """Close the S3 client singleton if it was created."""
+    global s3_client
+    with _s3_lock:
+        if s3_client is not None:
+            s3_client.close()
+            s3_client = None
+
+
+class AsyncS3Client:
+    """Async S3 client for FastAPI request paths.
+    
+    Uses aioboto3 so awaiting S3 reads does not block the event loop. The
+    underlying client is opened once (see open()) and reused across requests.
+    """
+
+    def __init__(self):
+        """Initialize the async S3 session with credentials from environment variables."""
+        self.bucket_name = os.environ.get("AWS_S3_BUCKET_NAME")
+        if not self.bucket_name:
+            raise ValueError("AWS_S3_BUCKET_NAME environment variable is not set")
+        
+        self._session = aioboto3.Session(
+            aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
+            aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
+            region_name=os.environ.get("AWS_REGION", "us-east-1")
+        )
+        self._client_cm = None
+        self._client = None
+        self._open_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(MAX_FETCH_WORKERS)
+
+    async def open(self) -> None:
+        """Open the underlying S3 client. Safe to call more than once.
+        Concurrent first calls open only one client.
+        """
+        # Fast path once opened, no lock needed
+        if self._client is not None:
+            return
+        async with self._open_lock:
+            if self._client is not None:
+                return
+            client_cm = self._session.client(
+                's3',
+                config=S3_CLIENT_CONFIG
+            )
+            self._client = await client_cm.__aenter__()
+            self._client_cm = client_cm
+        logger.info(f"Async S3 client initialized with bucket: {self.bucket_name}")
+
+    async def close(self) -> None:
+        """Close the underlying S3 client if it is open."""
+        if self._client_cm is not None:
+            await self._client_cm.__aexit__(None, None, None)
+        self._client_cm = None
+        self._client = None
+
+    async def get_file_content_bytes(self, file_path: str) -> Optional[bytes]:
+        """Retrieve the raw bytes of a specific file from S3 without decoding.
+        
+        Args:
+            file_path (str): The path to the file in the S3 bucket
+            
+        Returns:
+            Optional[bytes]: The file content as bytes, or None if an error occurs
+        """
+        await self.open()
+        try:
+            async with self._semaphore:
+                response = await self._client.get_object(
+                    Bucket=self.bucket_name,
+                    Key=file_path
+                )
+                async with response['Body'] as body:
+                    return await body.read()
+            
+        except Exception as e:
+            logger.error(f"Error retrieving content for file '{file_path}': {str(e)}")
+            return None
+
+    async def get_file_content(self, file_path: str) -> Optional[str]:
+        """Retrieve the content of a specific file from S3.
+        
+        Args:
+            file_path (str): The path to the file in the S3 bucket
+            
+        Returns:
+            Optional[str]: The file content as a string, or None if an error occurs
+        """
+        content = await self.get_file_content_bytes(file_path)
+        if content is None:
+            return None
+        return content.decode('utf-8', errors='replace')
+
+    async def get_files_content(self, file_paths: List[str]) -> List[Optional[str]]:
+        """Retrieve the content of several files concurrently.
+        
+        Args:
+            file_paths (List[str]): The paths to the files in the S3 bucket
+            
+        Returns:
+            List[Optional[str]]: File contents in the same order as file_paths,
+                                 with None for files that could not be read
+        """
+        return await asyncio.gather(*(self.get_file_content(path) for path in file_paths))
+
+# Create a singleton instance for async callers
+async_s3_client = None
+
+def get_async_s3_client() -> AsyncS3Client:
+    """Get or create the async S3 client singleton instance.
+    
+    Returns:
+        AsyncS3Client: The async S3 client instance
+    """
+    global async_s3_client
+    if async_s3_client is None:
+        async_s3_client = AsyncS3Client()
+    return async_s3_client
+
+async def close_async_s3_client() -> None:
+    """Close the async S3 client singleton if it was created."""
+    global async_s3_client
+    if async_s3_client is not None:
+        await async_s3_client.close()
+        async_s3_client = None
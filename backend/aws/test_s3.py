@@ -16,72 +16,72 @@ from backend.aws.s3 import get_s3_client
 
 def run_s3_tests():
     """Run tests for the S3 client functionality"""
-    print("\n===== S3 CLIENT TEST =====\n")
+    logger.info("===== S3 CLIENT TEST =====")
     
     # Step 1: Initialize the client
-    print("Initializing S3 client...")
+    logger.info("Initializing S3 client...")
     s3 = get_s3_client()
     
     if not s3:
-        print("❌ Failed to initialize S3 client. Check your AWS credentials and .env file.")
+        logger.error("[FAIL] Failed to initialize S3 client. Check your AWS credentials and .env file.")
         return
     
-    print("✅ S3 client initialized successfully!")
-    print(f"   Bucket name: {s3.bucket_name}")
+    logger.info(f"[OK] S3 client initialized successfully! Bucket name: {s3.bucket_name}")
     
     # Step 2: List directories and files
-    print("\nListing files by directory...")
+    logger.info("Listing files by directory...")
     try:
         files_by_directory = s3.list_files_by_directory()
         
         if not files_by_directory:
-            print("⚠️ No files found in the bucket or an error occurred.")
+            logger.warning("[WARN] No files found in the bucket or an error occurred.")
         else:
-            print(f"✅ Found {len(files_by_directory)} directories.")
+            logger.info(f"[OK] Found {len(files_by_directory)} directories.")
             
-            # Print directory structure
+            # Log directory structure, one record per directory
             for dir_name, files in files_by_directory.items():
-                print(f"\n📁 Directory: {dir_name} ({len(files)} files)")
-                # Print first 3 files as examples
-                for i, file_path in enumerate(files[:3]):
-                    print(f"   {i+1}. {file_path}")
+                lines = [f"Directory: {dir_name} ({len(files)} files)"]
+                # Show first 3 files as examples
+                lines.extend(f"   {i+1}. {file_path}" for i, file_path in enumerate(files[:3]))
                 if len(files) > 3:
-                    print(f"   ... and {len(files) - 3} more files")
+                    lines.append(f"   ... and {len(files) - 3} more files")
+                logger.info("\n".join(lines))
             
             # Step 3: Test file content retrieval for a specific directory
             if files_by_directory:
                 # Choose first directory with files for testing
                 test_dir = next(iter(files_by_directory))
-                print(f"\nTesting file content retrieval for directory: {test_dir}")
+                logger.info(f"Testing file content retrieval for directory: {test_dir}")
                 contents = s3.get_files_content_by_directory(test_dir)
                 
-                if contents:
-                    print(f"✅ Successfully retrieved {len(contents)} file contents.")
+                fetched = [fetch.content for fetch in contents if fetch.ok]
+                if fetched:
+                    logger.info(f"[OK] Successfully retrieved {len(fetched)} of {len(contents)} file contents.")
                     # Show preview of first file content
-                    if len(contents) > 0:
-                        print("\nPreview of first file content:")
-                        preview = contents[0][:200] + "..." if len(contents[0]) > 200 else contents[0]
-                        print(f"---\n{preview}\n---")
+                    first = fetched[0]
+                    preview = f"{first[:200]}..." if len(first) > 200 else first
+                    logger.info(f"Preview of first file content:\n---\n{preview}\n---")
                 else:
-                    print("❌ Failed to retrieve file contents.")
+                    logger.error("[FAIL] Failed to retrieve file contents.")
                 
                 # Step 4: Test individual file content retrieval
                 if files_by_directory[test_dir]:
                     test_file = files_by_directory[test_dir][0]
-                    print(f"\nTesting individual file content retrieval: {test_file}")
-                    file_content = s3.get_file_content(test_file)
+                    logger.info(f"Testing individual file content retrieval: {test_file}")
+                    file_content = s3.get_file_content_bytes(test_file)
                     
                     if file_content:
-                        print(f"✅ Successfully retrieved file content.")
-                        preview = file_content[:200] + "..." if len(file_content) > 200 else file_content
-                        print(f"---\n{preview}\n---")
+                        # Only decode the bytes we actually show
+                        preview = file_content[:200].decode('utf-8', errors='ignore')
+                        suffix = "..." if len(file_content) > 200 else ""
+                        logger.info(f"[OK] Successfully retrieved file content.\n---\n{preview}{suffix}\n---")
                     else:
-                        print("❌ Failed to retrieve file content.")
+                        logger.error("[FAIL] Failed to retrieve file content.")
     
     except Exception as e:
-        print(f"❌ Error during testing: {str(e)}")
+        logger.error(f"[FAIL] Error during testing: {str(e)}")
     
-    print("\n===== TEST COMPLETE =====")
+    logger.info("===== TEST COMPLETE =====")
 
 if __name__ == "__main__":
-    run_s3_tests() 
\ No newline at end of file
+    run_s3_tests()
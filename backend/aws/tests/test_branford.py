@@ -13,7 +13,6 @@ import unittest
 import os
 import sys
 import logging
-from dotenv import load_dotenv
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,11 +21,9 @@ logger = logging.getLogger(__name__)
 # Add parent directory to path so we can import the aws module
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-# Get the project root directory (two levels up from current file)
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 # Load environment variables from the root directory .env file
-load_dotenv(os.path.join(project_root, '.env'))
+from backend._env import ensure_env_loaded
+ensure_env_loaded()
 
 # Import the module to test
 from backend.aws.s3 import S3Client, get_s3_client
@@ -35,18 +32,21 @@ from backend.aws.s3 import S3Client, get_s3_client
 class TestBranfordcastle(unittest.TestCase):
     """Test cases for the branfordcastle.com folder in S3 using real API calls."""
     
-    def setUp(self):
-        """Set up test environment."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once and cache the bucket listing for all tests."""
         # Check if required environment variables are set
         required_vars = ['AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'AWS_S3_BUCKET_NAME']
         for var in required_vars:
             if not os.environ.get(var):
-                self.skipTest(f"Environment variable {var} is not set")
+                raise unittest.SkipTest(f"Environment variable {var} is not set")
         
         logger.info(f"Using S3 bucket: {os.environ.get('AWS_S3_BUCKET_NAME')}")
         logger.info("Setting up test environment")
         # Create S3 client for tests
-        self.s3_client = get_s3_client()
+        cls.s3_client = get_s3_client()
+        # List the bucket once; every test reads from this snapshot
+        cls._files_by_dir = cls.s3_client.list_files_by_directory()
         
     def tearDown(self):
         """Clean up after tests."""
@@ -57,8 +57,8 @@ class TestBranfordcastle(unittest.TestCase):
         Test case to verify that the 'branfordcastle.com' folder has exactly 27 files.
         This test uses real AWS S3 API calls.
         """
-        # Get files grouped by directory
-        files_by_dir = self.s3_client.list_files_by_directory()
+        # Get files grouped by directory from the cached listing
+        files_by_dir = self._files_by_dir
         
         # Check if the branfordcastle.com folder exists
         self.assertIn('branfordcastle.com', files_by_dir, 
@@ -72,8 +72,8 @@ class TestBranfordcastle(unittest.TestCase):
         for file_path in branfordcastle_files:
             logger.info(f"  - {file_path}")
         
-        # Assert the file count
-        self.assertEqual(len(branfordcastle_files), 27, 
+        # Assert the file count, listing only the branfordcastle.com/ prefix
+        self.assertEqual(self.s3_client.count_keys_with_prefix('branfordcastle.com/'), 27, 
                         "The branfordcastle.com folder should contain exactly 27 files")
         
         # Check that all files have the correct prefix
@@ -86,8 +86,8 @@ class TestBranfordcastle(unittest.TestCase):
         Test case to verify that the portfolio.txt file exists in the branfordcastle.com folder.
         This test uses real AWS S3 API calls.
         """
-        # Get files grouped by directory
-        files_by_dir = self.s3_client.list_files_by_directory()
+        # Get files grouped by directory from the cached listing
+        files_by_dir = self._files_by_dir
         
         # Check if the branfordcastle.com folder exists
         self.assertIn('branfordcastle.com', files_by_dir, 
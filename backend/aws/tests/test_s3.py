@@ -4,11 +4,13 @@ Test module for S3 utilities using mock data.
 This module contains test cases for the S3 client functionality using mock data.
 """
 
+import asyncio
 import unittest
 import os
 import sys
 import logging
-from unittest.mock import patch, MagicMock
+import httpx
+from unittest.mock import patch, MagicMock, AsyncMock, ANY
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -18,7 +20,7 @@ logger = logging.getLogger(__name__)
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 # Import the module to test
-from backend.aws.s3 import S3Client, get_s3_client
+from backend.aws.s3 import S3Client, AsyncS3Client, FetchStatus, get_s3_client, MAX_FETCH_WORKERS, RANGED_FETCH_THRESHOLD
 
 
 class TestS3Client(unittest.TestCase):
@@ -58,9 +60,15 @@ class TestS3Client(unittest.TestCase):
                 's3',
                 aws_access_key_id='test_access_key',
                 aws_secret_access_key='test_secret_key',
-                region_name='us-west-2'
+                region_name='us-west-2',
+                config=ANY
             )
             
+            # Verify the connection pool is sized for concurrent fetches
+            config = mock_boto_client.call_args.kwargs['config']
+            self.assertEqual(config.max_pool_connections, MAX_FETCH_WORKERS)
+            self.assertTrue(config.tcp_keepalive)
+            
             # Verify bucket name was set correctly
             self.assertEqual('test-bucket', s3_client.bucket_name)
             
@@ -92,6 +100,384 @@ class TestS3Client(unittest.TestCase):
             
             logger.info("Successfully tested S3Client raises error when bucket name is missing")
 
+    @patch('boto3.client')
+    def test_get_files_content_by_directory_preserves_order(self, mock_boto_client):
+        """Test that concurrent fetches return contents in listing order."""
+        # Setup mock
+        mock_client = MagicMock()
+        mock_boto_client.return_value = mock_client
+        keys = [f'example.com/file_{i}.txt' for i in range(10)]
+        
+        def get_object(Bucket, Key):
+            if Key.endswith('file_3.txt'):
+                raise Exception("Access denied")
+            body = MagicMock()
+            body.read.return_value = f"content of {Key}".encode('utf-8')
+            return {'Body': body}
+        
+        mock_client.get_object.side_effect = get_object
+        
+        with patch.dict(os.environ, {'AWS_S3_BUCKET_NAME': 'test-bucket'}):
+            s3_client = S3Client()
+            s3_client._http = None  # exercise the boto3 GetObject path
+            with patch.object(s3_client, '_list_keys_with_prefix', return_value=keys):
+                contents = s3_client.get_files_content_by_directory('example.com')
+        
+        # Verify every file was fetched and results line up with the listing
+        self.assertEqual(len(contents), len(keys))
+        for key, fetch in zip(keys, contents):
+            self.assertEqual(fetch.key, key)
+            if key.endswith('file_3.txt'):
+                self.assertEqual(fetch.status, FetchStatus.ERROR)
+                self.assertIsNone(fetch.content)
+                self.assertEqual(fetch.error, 'Exception')
+            else:
+                self.assertTrue(fetch.ok)
+                self.assertEqual(fetch.content, f"content of {key}")
+        
+        logger.info("Successfully tested ordered concurrent directory fetch")
+
+    @patch('boto3.client')
+    def test_list_files_by_directory_is_cached(self, mock_boto_client):
+        """Test that repeated listings reuse the cached result until invalidated."""
+        # Setup mock
+        mock_client = MagicMock()
+        mock_boto_client.return_value = mock_client
+        mock_paginator = MagicMock()
+        mock_paginator.paginate.return_value = [
+            {'Contents': [{'Key': 'example.com/index.txt'}, {'Key': 'readme.txt'}]}
+        ]
+        mock_client.get_paginator.return_value = mock_paginator
+        
+        with patch.dict(os.environ, {'AWS_S3_BUCKET_NAME': 'test-bucket'}):
+            s3_client = S3Client()
+            first = s3_client.list_files_by_directory()
+            second = s3_client.list_files_by_directory()
+            
+            # Verify the bucket was only paginated once
+            self.assertEqual(first, {'example.com': ['example.com/index.txt'], 'root': ['readme.txt']})
+            self.assertEqual(first, second)
+            self.assertEqual(mock_paginator.paginate.call_count, 1)
+            
+            # Verify callers get copies that cannot corrupt the cache
+            first['example.com'].append('example.com/extra.txt')
+            second.pop('root')
+            self.assertEqual(
+                s3_client.list_files_by_directory(),
+                {'example.com': ['example.com/index.txt'], 'root': ['readme.txt']}
+            )
+            
+            # Verify invalidation forces a fresh listing
+            s3_client.invalidate_listing_cache()
+            s3_client.list_files_by_directory()
+            self.assertEqual(mock_paginator.paginate.call_count, 2)
+        
+        logger.info("Successfully tested listing cache")
+
+    @patch('boto3.client')
+    def test_get_files_content_by_directory_lists_by_prefix(self, mock_boto_client):
+        """Test that a single-directory fetch only lists keys under that prefix."""
+        # Setup mock
+        mock_client = MagicMock()
+        mock_boto_client.return_value = mock_client
+        mock_paginator = MagicMock()
+        mock_paginator.paginate.return_value = [
+            {'Contents': [{'Key': 'example.com/'}, {'Key': 'example.com/index.txt'}]}
+        ]
+        mock_client.get_paginator.return_value = mock_paginator
+        body = MagicMock()
+        body.read.return_value = b"hello"
+        mock_client.get_object.return_value = {'Body': body}
+        
+        with patch.dict(os.environ, {'AWS_S3_BUCKET_NAME': 'test-bucket'}):
+            s3_client = S3Client()
+            s3_client._http = None  # exercise the boto3 GetObject path
+            contents = s3_client.get_files_content_by_directory('example.com')
+        
+        # Verify S3 was asked for the directory prefix only and markers were skipped
+        mock_paginator.paginate.assert_called_once_with(Bucket='test-bucket', Prefix='example.com/')
+        mock_client.get_object.assert_called_once_with(Bucket='test-bucket', Key='example.com/index.txt')
+        self.assertEqual([fetch.content for fetch in contents], ["hello"])
+        
+        logger.info("Successfully tested prefix listing for a single directory")
+
+    @patch('boto3.client')
+    def test_count_keys_with_prefix(self, mock_boto_client):
+        """Test that prefix counts use KeyCount and ignore directory markers."""
+        # Setup mock
+        mock_client = MagicMock()
+        mock_boto_client.return_value = mock_client
+        mock_paginator = MagicMock()
+        mock_paginator.paginate.return_value = [
+            {'KeyCount': 3, 'Contents': [{'Key': 'example.com/'}, {'Key': 'example.com/a.txt'},
+                                         {'Key': 'example.com/b.txt'}]},
+            {'KeyCount': 1, 'Contents': [{'Key': 'example.com/c.txt'}]},
+            {'KeyCount': 0},
+        ]
+        mock_client.get_paginator.return_value = mock_paginator
+        
+        with patch.dict(os.environ, {'AWS_S3_BUCKET_NAME': 'test-bucket'}):
+            s3_client = S3Client()
+            count = s3_client.count_keys_with_prefix('example.com/')
+        
+        # Verify only the prefix was listed and markers were excluded
+        mock_paginator.paginate.assert_called_once_with(Bucket='test-bucket', Prefix='example.com/')
+        self.assertEqual(count, 3)
+        
+        logger.info("Successfully tested prefix key count")
+    
+    @patch('boto3.client')
+    def test_iter_files_content_by_directory(self, mock_boto_client):
+        """Test that the streaming variant yields one fetch result at a time."""
+        # Setup mock
+        mock_client = MagicMock()
+        mock_boto_client.return_value = mock_client
+        keys = ['example.com/a.txt', 'example.com/b.txt']
+        bodies = {}
+        
+        def get_object(Bucket, Key):
+            body = MagicMock()
+            body.read.return_value = Key.encode('utf-8')
+            bodies[Key] = body
+            return {'Body': body}
+        
+        mock_client.get_object.side_effect = get_object
+        
+        with patch.dict(os.environ, {'AWS_S3_BUCKET_NAME': 'test-bucket'}):
+            s3_client = S3Client()
+            s3_client._http = None  # exercise the boto3 GetObject path
+            with patch.object(s3_client, '_list_keys_with_prefix', return_value=keys):
+                iterator = s3_client.iter_files_content_by_directory('example.com')
+                
+                # Nothing is fetched until the generator is consumed
+                mock_client.get_object.assert_not_called()
+                first = next(iterator)
+                self.assertEqual((first.key, first.content), ('example.com/a.txt', 'example.com/a.txt'))
+                self.assertEqual(mock_client.get_object.call_count, 1)
+                self.assertEqual([(f.key, f.content) for f in iterator], [('example.com/b.txt', 'example.com/b.txt')])
+        
+        # Verify each body was closed after reading
+        for body in bodies.values():
+            body.close.assert_called_once()
+        
+        logger.info("Successfully tested streaming directory fetch")
+
+    @patch('boto3.client')
+    def test_get_file_content_ranged_reassembles_parts(self, mock_boto_client):
+        """Test that large objects are fetched as byte ranges and stitched back together."""
+        # Setup mock
+        mock_client = MagicMock()
+        mock_boto_client.return_value = mock_client
+        data = (b"0123456789" * (RANGED_FETCH_THRESHOLD // 10 + 1))[:RANGED_FETCH_THRESHOLD + 5]
+        mock_client.head_object.return_value = {'ContentLength': len(data)}
+        
+        def get_object(Bucket, Key, Range):
+            start, end = map(int, Range[len('bytes='):].split('-'))
+            body = MagicMock()
+            body.read.return_value = data[start:end + 1]
+            return {'Body': body}
+        
+        mock_client.get_object.side_effect = get_object
+        
+        with patch.dict(os.environ, {'AWS_S3_BUCKET_NAME': 'test-bucket'}):
+            s3_client = S3Client()
+            content = s3_client.get_file_content_ranged('big.txt', part_size=4 * 1024 * 1024)
+        
+        # Verify the object was split into ranges and reassembled in order
+        self.assertEqual(mock_client.get_object.call_count, 5)
+        self.assertEqual(content, data.decode('utf-8'))
+        
+        logger.info("Successfully tested ranged fetch of a large object")
+
+    @patch('boto3.client')
+    def test_get_file_content_bytes_and_lenient_decode(self, mock_boto_client):
+        """Test that raw bytes are returned as-is and text decoding never raises."""
+        # Setup mock
+        mock_client = MagicMock()
+        mock_boto_client.return_value = mock_client
+        raw = b"caf\xc3\xa9 \xff"
+        
+        def get_object(Bucket, Key):
+            body = MagicMock()
+            body.read.return_value = raw
+            return {'Body': body}
+        
+        mock_client.get_object.side_effect = get_object
+        
+        with patch.dict(os.environ, {'AWS_S3_BUCKET_NAME': 'test-bucket'}):
+            s3_client = S3Client()
+            
+            # Verify bytes skip decoding and invalid UTF-8 is replaced in text
+            self.assertEqual(s3_client.get_file_content_bytes('a.txt'), raw)
+            self.assertEqual(s3_client.get_file_content('a.txt'), "caf\u00e9 \ufffd")
+        
+        logger.info("Successfully tested bytes retrieval and lenient decoding")
+
+    @patch('boto3.client')
+    def test_get_s3_client_is_thread_safe_singleton(self, mock_boto_client):
+        """Test that concurrent first calls to get_s3_client build a single client."""
+        from concurrent.futures import ThreadPoolExecutor
+        import backend.aws.s3 as s3_module
+        
+        with patch.dict(os.environ, {'AWS_S3_BUCKET_NAME': 'test-bucket'}), \
+                patch.object(s3_module, 's3_client', None):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                clients = list(executor.map(lambda _: get_s3_client(), range(32)))
+        
+        # Verify every caller got the same instance and boto3 was called once
+        self.assertTrue(all(client is clients[0] for client in clients))
+        mock_boto_client.assert_called_once()
+        
+        logger.info("Successfully tested thread-safe singleton")
+
+    @patch('boto3.client')
+    def test_get_file_content_revalidates_with_etag(self, mock_boto_client):
+        """Test that a repeat read sends If-None-Match and reuses the cached body on 304."""
+        from botocore.exceptions import ClientError
+        
+        # Setup mock
+        mock_client = MagicMock()
+        mock_boto_client.return_value = mock_client
+        body = MagicMock()
+        body.read.return_value = b"portfolio"
+        not_modified = ClientError({'Error': {'Code': '304', 'Message': 'Not Modified'}}, 'GetObject')
+        mock_client.get_object.side_effect = [{'Body': body, 'ETag': '"abc"'}, not_modified]
+        
+        with patch.dict(os.environ, {'AWS_S3_BUCKET_NAME': 'test-bucket'}):
+            s3_client = S3Client()
+            first = s3_client.get_file_content('example.com/portfolio.txt')
+            second = s3_client.get_file_content('example.com/portfolio.txt')
+        
+        # Verify the second request was conditional and served from cache
+        self.assertEqual(first, "portfolio")
+        self.assertEqual(second, "portfolio")
+        mock_client.get_object.assert_called_with(
+            Bucket='test-bucket', Key='example.com/portfolio.txt', IfNoneMatch='"abc"'
+        )
+        
+        logger.info("Successfully tested ETag revalidation")
+
+    @patch('boto3.client')
+    def test_fetch_one_signs_direct_http_get(self, mock_boto_client):
+        """Test that the hot-path GET is SigV4-signed and sent over the shared HTTP client."""
+        test_env_vars = {
+            'AWS_ACCESS_KEY_ID': 'test_access_key',
+            'AWS_SECRET_ACCESS_KEY': 'test_secret_key',
+            'AWS_S3_BUCKET_NAME': 'test-bucket',
+            'AWS_REGION': 'us-west-2'
+        }
+        
+        with patch.dict(os.environ, test_env_vars):
+            s3_client = S3Client()
+            mock_http = MagicMock()
+            mock_http.get.return_value.content = b"hello"
+            s3_client._http = mock_http
+            fetch = s3_client._fetch_one('example.com/about us.txt')
+        
+        # Verify the request went straight to the virtual-hosted URL with a signature
+        self.assertTrue(fetch.ok)
+        self.assertEqual(fetch.content, "hello")
+        url = mock_http.get.call_args.args[0]
+        headers = mock_http.get.call_args.kwargs['headers']
+        self.assertEqual(url, 'https://test-bucket.s3.us-west-2.amazonaws.com/example.com/about%20us.txt')
+        self.assertTrue(headers['Authorization'].startswith('AWS4-HMAC-SHA256 Credential=test_access_key/'))
+        mock_boto_client.return_value.get_object.assert_not_called()
+        
+        logger.info("Successfully tested signed direct GET")
+
+    @patch('backend.aws.s3.time.sleep')
+    @patch('boto3.client')
+    def test_signed_get_retries_throttling_and_connection_errors(self, mock_boto_client, mock_sleep):
+        """Test that the signed GET backs off on 503s and dropped connections before succeeding."""
+        test_env_vars = {
+            'AWS_ACCESS_KEY_ID': 'test_access_key',
+            'AWS_SECRET_ACCESS_KEY': 'test_secret_key',
+            'AWS_S3_BUCKET_NAME': 'test-bucket',
+            'AWS_REGION': 'us-west-2'
+        }
+        
+        throttled = MagicMock(status_code=503)
+        ok = MagicMock(status_code=200, content=b"hello")
+        
+        with patch.dict(os.environ, test_env_vars):
+            s3_client = S3Client()
+            mock_http = MagicMock()
+            mock_http.get.side_effect = [throttled, httpx.ConnectError("reset"), ok]
+            s3_client._http = mock_http
+            fetch = s3_client._fetch_one('example.com/about.txt')
+            s3_client.close()
+        
+        # Verify the third attempt succeeded after two backoffs, and close released the client
+        self.assertTrue(fetch.ok)
+        self.assertEqual(fetch.content, "hello")
+        self.assertEqual(mock_http.get.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        throttled.raise_for_status.assert_not_called()
+        mock_http.close.assert_called_once()
+        
+        logger.info("Successfully tested signed GET retries")
+
+
+class TestAsyncS3Client(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the AsyncS3Client class using mock data."""
+    
+    async def test_get_files_content_gathers_in_order(self):
+        """Test that concurrent async fetches return contents in request order."""
+        # Setup mock
+        mock_client = MagicMock()
+        
+        async def get_object(Bucket, Key):
+            if Key == 'missing.txt':
+                raise Exception("NoSuchKey")
+            body = MagicMock()
+            body.__aenter__ = AsyncMock(return_value=body)
+            body.__aexit__ = AsyncMock(return_value=False)
+            body.read = AsyncMock(return_value=Key.encode('utf-8'))
+            return {'Body': body}
+        
+        mock_client.get_object.side_effect = get_object
+        mock_client_cm = MagicMock()
+        mock_client_cm.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client_cm.__aexit__ = AsyncMock(return_value=False)
+        
+        with patch.dict(os.environ, {'AWS_S3_BUCKET_NAME': 'test-bucket'}):
+            s3_client = AsyncS3Client()
+            with patch.object(s3_client._session, 'client', return_value=mock_client_cm):
+                contents = await s3_client.get_files_content(['a.txt', 'missing.txt', 'b.txt'])
+                await s3_client.close()
+        
+        # Verify order is preserved and failures map to None
+        self.assertEqual(contents, ['a.txt', None, 'b.txt'])
+        mock_client_cm.__aexit__.assert_awaited_once()
+        
+        logger.info("Successfully tested async concurrent fetch")
+    
+    async def test_concurrent_open_creates_one_client(self):
+        """Test that concurrent first calls open a single underlying client."""
+        # Setup mock whose __aenter__ yields to the event loop like a real client
+        mock_client = MagicMock()
+        
+        async def enter():
+            await asyncio.sleep(0)
+            return mock_client
+        
+        mock_client_cm = MagicMock()
+        mock_client_cm.__aenter__ = AsyncMock(side_effect=enter)
+        mock_client_cm.__aexit__ = AsyncMock(return_value=False)
+        
+        with patch.dict(os.environ, {'AWS_S3_BUCKET_NAME': 'test-bucket'}):
+            s3_client = AsyncS3Client()
+            with patch.object(s3_client._session, 'client', return_value=mock_client_cm) as mock_session_client:
+                await asyncio.gather(*(s3_client.open() for _ in range(5)))
+                await s3_client.close()
+        
+        # Verify only one client was created and entered
+        mock_session_client.assert_called_once()
+        mock_client_cm.__aenter__.assert_awaited_once()
+        mock_client_cm.__aexit__.assert_awaited_once()
+        
+        logger.info("Successfully tested concurrent async open")
+
 
 # Run the tests if this file is executed directly
 if __name__ == "__main__":
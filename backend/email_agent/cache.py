@@ -0,0 +1,139 @@
+"""
+Email Agent Response Cache.
+
+This module contains a semantic cache for generated emails so that re-runs
+over near-identical buyer profiles can skip the Gemini call.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(embedding: Sequence[float]) -> np.ndarray:
+    """Convert an embedding to a unit-length float32 vector."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """
+    SQLite-backed cache of generated emails keyed by buyer profile embedding.
+    
+    A lookup hits when a stored profile for the same company name and URL,
+    generated with the same prompt and template, has cosine similarity at or
+    above the threshold. The exact company/URL match is a lexical guard so two
+    different buyers with similar narratives never share an email, and the
+    prompt digest retires every entry when the prompt or template changes.
+    
+    Callers compute the embeddings, so they can be throttled alongside the
+    generation requests.
+    """
+    
+    def __init__(self, db_path: Path, threshold: float = 0.95):
+        """
+        Initialize the cache.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            threshold: Minimum cosine similarity for a hit
+        """
+        self.threshold = threshold
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    content_hash TEXT PRIMARY KEY,
+                    company_name TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    response TEXT NOT NULL,
+                    prompt_digest TEXT NOT NULL DEFAULT ''
+                )
+                """
+            )
+            # Caches created before the prompt digest column never match again
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(responses)")}
+            if "prompt_digest" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE responses ADD COLUMN prompt_digest TEXT NOT NULL DEFAULT ''"
+                )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_company ON responses (company_name, url)"
+            )
+    
+    def lookup(
+        self, company_name: str, url: str, prompt_digest: str, embedding: Sequence[float]
+    ) -> Optional[str]:
+        """
+        Return a cached response for a near-identical profile of the same buyer.
+        
+        Args:
+            company_name: Buyer company name (must match exactly)
+            url: Buyer URL (must match exactly)
+            prompt_digest: Digest of the prompt and template (must match exactly)
+            embedding: Embedding of the buyer profile text
+            
+        Returns:
+            The cached email content, or None on a miss
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT embedding, response FROM responses "
+                "WHERE company_name = ? AND url = ? AND prompt_digest = ?",
+                (company_name, url, prompt_digest)
+            ).fetchall()
+        if not rows:
+            return None
+        
+        query = _normalize(embedding)
+        best_score, best_response = -1.0, None
+        for blob, response in rows:
+            score = float(np.dot(query, np.frombuffer(blob, dtype=np.float32)))
+            if score > best_score:
+                best_score, best_response = score, response
+        
+        if best_score >= self.threshold:
+            logger.info(f"Semantic cache hit for {company_name} (similarity {best_score:.3f})")
+            return best_response
+        return None
+    
+    def store(
+        self,
+        company_name: str,
+        url: str,
+        prompt_digest: str,
+        content: str,
+        embedding: Sequence[float],
+        response: str
+    ) -> None:
+        """
+        Store a generated response for a buyer profile.
+        
+        Args:
+            company_name: Buyer company name
+            url: Buyer URL
+            prompt_digest: Digest of the prompt and template
+            content: Buyer profile text
+            embedding: Embedding of the buyer profile text
+            response: Generated email content
+        """
+        content_hash = hashlib.sha256(f"{prompt_digest}:{content}".encode('utf-8')).hexdigest()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(content_hash, company_name, url, embedding, response, prompt_digest) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (content_hash, company_name, url, _normalize(embedding).tobytes(), response, prompt_digest)
+            )
@@ -4,6 +4,7 @@ Email Agent Configuration.
 This module contains configuration settings for the email agent.
 """
 import os
+from functools import lru_cache
 from pathlib import Path
 
 # Model configuration
@@ -14,18 +15,65 @@ MAX_OUTPUT_TOKENS = 4096
 # API configuration
 API_KEY = os.environ.get("GOOGLE_API_KEY", "")
 
-# File paths
-REASONING_DIR = Path(os.path.expanduser("~/Documents/GitHub/MA_Agents/backend/reasoning_agent/output/7th_Run_TestRun_(Success)"))
-OUTPUT_DIR = Path(os.path.expanduser("~/Documents/Github/MA_Agents/backend/email_agent/output"))
+# File paths are resolved lazily so importing this module does no filesystem work
+_PROJECT_DIR = "~/Documents/GitHub/MA_Agents/backend"
 
-# Ensure the output directory exists
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+@lru_cache(maxsize=1)
+def get_reasoning_dir() -> Path:
+    """Directory containing the reasoning agent output files."""
+    return Path(os.path.expanduser(f"{_PROJECT_DIR}/reasoning_agent/output/7th_Run_TestRun_(Success)"))
+
+@lru_cache(maxsize=1)
+def get_output_dir() -> Path:
+    """Directory for generated emails, created on first access."""
+    output_dir = Path(os.path.expanduser(f"{_PROJECT_DIR}/email_agent/output"))
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return output_dir
 
 # Filter settings
 BUYER_PREFIX = "STRONG"
 
 # Email template path with the new text file
-EMAIL_TEMPLATE_PATH = Path(os.path.expanduser("~/Documents/GitHub/MA_Agents/backend/email_agent/template.txt"))
+@lru_cache(maxsize=1)
+def get_email_template_path() -> Path:
+    """Path to the email template file."""
+    return Path(os.path.expanduser(f"{_PROJECT_DIR}/email_agent/template.txt"))
+
+# Concurrency and provider quota settings for email generation
+MAX_CONCURRENT_REQUESTS = 8
+REQUESTS_PER_MINUTE = 60
+TOKENS_PER_MINUTE = 1_000_000
+
+# Most buyers the pipeline groups into one Gemini request. The default of 1 sends
+# one request per buyer; raise it only when requests per minute, not tokens, is the
+# limit. Only buyers already queued are grouped.
+EMAILS_PER_REQUEST = 1
+
+# Attempts per Gemini request on rate-limit or transient server errors, with
+# exponential backoff starting at the base delay (seconds)
+API_MAX_ATTEMPTS = 3
+API_RETRY_BASE_DELAY = 2.0
+
+# Workers parsing reasoning files (None = one per CPU, 1 = serial). Files over 64KB
+# are parsed in worker processes; smaller files are parsed in threads
+EXTRACTION_WORKERS = None
+
+# Output format for generated emails: "docx" (Word document) or "eml" (plain-text email draft)
+OUTPUT_FORMAT = "docx"
+
+# Pipeline settings: items buffered between stages and threads writing output files
+PIPELINE_QUEUE_SIZE = 8
+SAVE_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+# Skip buyers that already have an email in the output format (saves Gemini calls on reruns)
+SKIP_EXISTING_OUTPUTS = True
+
+# Buyer profiles whose final assessment is shorter than this are sent to Gemini in full
+PROFILE_FALLBACK_MIN_CHARS = 200
+
+# Semantic response cache settings
+EMBEDDING_MODEL_ID = "models/text-embedding-004"
+SEMANTIC_CACHE_THRESHOLD = 0.95
 
 # Additional settings
 LOG_LEVEL = "INFO"
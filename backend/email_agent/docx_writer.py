@@ -0,0 +1,110 @@
+"""
+Email Agent Word Documents.
+
+This module lays out generated emails as Word documents. It is imported on
+first use, so runs that only write .eml drafts never load python-docx.
+"""
+
+import re
+from functools import lru_cache
+from io import BytesIO
+from typing import Iterable, Optional, Tuple
+
+from docx import Document
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+_RE_RUN_BREAK = re.compile(r'([\t\n\r])')
+
+# Word paragraph style ids used when building email documents
+_STYLE_HEADING = "Heading1"
+_STYLE_BULLET = "ListBullet"
+
+
+@lru_cache(maxsize=1)
+def _blank_docx() -> bytes:
+    """Serialize a blank Word document once; each email document is loaded from these bytes."""
+    blank_doc = BytesIO()
+    Document().save(blank_doc)
+    return blank_doc.getvalue()
+
+
+def _make_run(text: str, bold: bool = False):
+    """Build a <w:r> element, turning tabs and line breaks into their own elements like Run.text."""
+    run = OxmlElement('w:r')
+    if bold:
+        run_props = OxmlElement('w:rPr')
+        run_props.append(OxmlElement('w:b'))
+        run.append(run_props)
+    for piece in _RE_RUN_BREAK.split(text):
+        if piece == '\t':
+            run.append(OxmlElement('w:tab'))
+        elif piece in ('\n', '\r'):
+            run.append(OxmlElement('w:br'))
+        elif piece:
+            text_elem = OxmlElement('w:t')
+            text_elem.text = piece
+            if piece != piece.strip():
+                text_elem.set(qn('xml:space'), 'preserve')
+            run.append(text_elem)
+    return run
+
+
+def _make_paragraph(runs: Iterable[Tuple[str, bool]], style_id: Optional[str] = None):
+    """Build a <w:p> element from (text, bold) runs with an optional paragraph style."""
+    paragraph = OxmlElement('w:p')
+    if style_id:
+        para_props = OxmlElement('w:pPr')
+        para_style = OxmlElement('w:pStyle')
+        para_style.set(qn('w:val'), style_id)
+        para_props.append(para_style)
+        paragraph.append(para_props)
+    for text, bold in runs:
+        if text:
+            paragraph.append(_make_run(text, bold))
+    return paragraph
+
+
+def build_email_document(url: str, parts) -> Document:
+    """
+    Build the Word document for a generated email.
+
+    Args:
+        url: Buyer URL shown in the metadata section
+        parts: EmailParts with the subject, team members and body paragraphs
+
+    Returns:
+        The populated document, ready to save
+    """
+    # Build the body as plain OXML elements and attach them to the document in one pass
+    elements = []
+
+    # Add metadata section at top
+    elements.append(_make_paragraph([("META INFORMATION", False)], _STYLE_HEADING))
+
+    # Add URL with proper formatting
+    elements.append(_make_paragraph([("URL: ", True), (url, False)]))
+
+    # Add team members with proper formatting and bullet points
+    elements.append(_make_paragraph([("Team Members:", True)]))
+    for member in parts.team_members:
+        elements.append(_make_paragraph([(member, False)], _STYLE_BULLET))
+
+    # Add horizontal line
+    elements.append(_make_paragraph([("─" * 50, False)]))
+
+    # Add the subject as a heading
+    elements.append(_make_paragraph([(parts.subject, False)], _STYLE_HEADING))
+
+    # Add the body paragraphs with their bold runs
+    for is_bullet, runs in parts.paragraphs:
+        elements.append(_make_paragraph(runs, _STYLE_BULLET if is_bullet else None))
+
+    # Insert before the section properties, which must stay the last body child
+    doc = Document(BytesIO(_blank_docx()))
+    body = doc.element.body
+    section_props = body.sectPr
+    insert_at = body.index(section_props) if section_props is not None else len(body)
+    body[insert_at:insert_at] = elements
+
+    return doc
@@ -8,42 +8,413 @@ emails based on reasoning agent outputs.
 import os
 import re
 import sys
+import asyncio
+import threading
 import logging
-import json
+import atexit
+import multiprocessing
+from logging.handlers import QueueHandler, QueueListener
+import orjson
+import hashlib
+import time
 import google.generativeai as genai
-from datetime import datetime
+from google.api_core import exceptions as google_exceptions
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from email import policy
+from email.message import EmailMessage
+from email.parser import BytesParser
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-import docx
-from docx import Document
-from docx.shared import Pt, Inches
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 import base64
-from io import BytesIO
+import zipfile
 
 from backend.email_agent.config import (
     MODEL_ID, TEMPERATURE, MAX_OUTPUT_TOKENS, API_KEY,
-    REASONING_DIR, OUTPUT_DIR, BUYER_PREFIX, EMAIL_TEMPLATE_PATH,
-    MAX_EMAILS_TO_GENERATE
+    get_reasoning_dir, get_output_dir, BUYER_PREFIX, get_email_template_path,
+    MAX_EMAILS_TO_GENERATE, MAX_CONCURRENT_REQUESTS, REQUESTS_PER_MINUTE,
+    TOKENS_PER_MINUTE, EMAILS_PER_REQUEST, API_MAX_ATTEMPTS, API_RETRY_BASE_DELAY, EMBEDDING_MODEL_ID, SEMANTIC_CACHE_THRESHOLD,
+    EXTRACTION_WORKERS, OUTPUT_FORMAT, PIPELINE_QUEUE_SIZE, SAVE_WORKERS, PROFILE_FALLBACK_MIN_CHARS,
+    SKIP_EXISTING_OUTPUTS
 )
-from backend.email_agent.prompts import EMAIL_PROMPT
+from backend.email_agent.cache import SemanticCache
+from backend.email_agent.prompts import EMAIL_PROMPT, EmailResponse
+from backend.email_agent.rate_limiter import RateLimiter
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('email_agent.log')
-    ]
-)
 logger = logging.getLogger(__name__)
 
+_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Queue carrying log records to the listener started by configure_logging, or None
+_log_queue: Optional[multiprocessing.Queue] = None
+_log_listener: Optional[QueueListener] = None
+_log_setup_lock = threading.Lock()
+
+def configure_logging() -> QueueListener:
+    """
+    Send log records through a queue to a background listener.
+    
+    Records are formatted by the queue handler and written by the listener
+    thread to email_agent.log and to the root logger's existing handlers (the
+    console if there are none), so concurrent workers never block on console
+    or file I/O. Parsing worker processes are given the same queue by
+    _init_worker_logging, so their records reach the listener too.
+    
+    Safe to call more than once: main() and run() both call it, and only the
+    first call sets logging up. The listener is stopped at exit, or earlier by
+    stop_logging().
+    
+    Returns:
+        The running listener
+    """
+    global _log_queue, _log_listener
+    with _log_setup_lock:
+        if _log_listener is not None:
+            return _log_listener
+        
+        # Existing root handlers keep their formatting but move behind the queue
+        root = logging.getLogger()
+        formatter = logging.Formatter(_LOG_FORMAT)
+        handlers = list(root.handlers)
+        if not handlers:
+            handlers = [logging.StreamHandler()]
+            handlers[0].setFormatter(formatter)
+            root.setLevel(logging.INFO)
+        file_handler = logging.FileHandler('email_agent.log')
+        file_handler.setFormatter(formatter)
+        
+        _log_queue = multiprocessing.Queue()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(QueueHandler(_log_queue))
+        _log_listener = QueueListener(_log_queue, *handlers, file_handler, respect_handler_level=True)
+        _log_listener.start()
+        atexit.register(stop_logging)
+        return _log_listener
+
+def stop_logging() -> None:
+    """Stop the listener started by configure_logging, writing any queued records."""
+    global _log_listener
+    with _log_setup_lock:
+        if _log_listener is not None:
+            _log_listener.stop()
+            _log_listener = None
+
+def _init_worker_logging(log_queue: multiprocessing.Queue, level: int) -> None:
+    """Process pool initializer that sends a worker's log records to the parent's queue."""
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(level)
+
+# Gemini errors worth retrying: quota exhaustion and transient server failures
+_RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+)
+
+# Precompiled patterns for reasoning-file parsing
+_RE_BUYER_FILENAME = re.compile(r'(?:STRONG|Strong|strong)_(?:buyer_)?(.+?)_reasoning_', re.IGNORECASE)
+_RE_OUTPUT_FILENAME = re.compile(r'^Email_(.+)_\d{8}_\d{6}(\.\w+)$')
+_RE_VALID_DOMAIN = re.compile(r'^[a-zA-Z0-9][-a-zA-Z0-9.]*\.[a-zA-Z]{2,}$')
+# Email addresses are matched by one shared pattern, alone or after a contact name
+_EMAIL_PATTERN = r'[a-zA-Z0-9._-]+@[a-zA-Z0-9._-]+\.[a-zA-Z0-9_-]+'
+_RE_EMAIL = re.compile(rf'({_EMAIL_PATTERN})')
+_RE_NAME_EMAIL = re.compile(rf'([A-Za-z\s.]+)(?:\([^)]+\))?\s*\|?\s*Email:\s*({_EMAIL_PATTERN})')
+
+# Precompiled patterns for email document formatting
+_RE_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+# Instruction part shared by every email request
+_PROMPT_PART = {"text": EMAIL_PROMPT}
+
+# Subject used when the generated email has none
+_DEFAULT_SUBJECT = "Project Elevate: Premier Parking Lift Distributor Buyout Opportunity"
+
+# Start of the content returned in place of an email when generation fails
+_GENERATION_ERROR_PREFIX = "Error generating email: "
+
+def _is_generation_error(email_content: str) -> bool:
+    """Return True if generation failed and the content is an error message, not an email."""
+    return email_content.startswith(_GENERATION_ERROR_PREFIX)
+
+def _output_holds_email(path: Path) -> bool:
+    """Return False for an output file that holds a generation error or cannot be read."""
+    try:
+        if path.suffix == ".eml":
+            text = BytesParser(policy=policy.default).parsebytes(path.read_bytes()).get_content()
+        else:
+            with zipfile.ZipFile(path) as archive:
+                text = archive.read("word/document.xml").decode('utf-8', errors='replace')
+    except (OSError, ValueError, KeyError, LookupError, zipfile.BadZipFile):
+        return False
+    return _GENERATION_ERROR_PREFIX.strip() not in text
+
+def _parse_email_response(email_content: str) -> Optional[Dict[str, Any]]:
+    """Parse a structured Gemini email, returning None for anything else (e.g. error text)."""
+    try:
+        email = orjson.loads(email_content)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(email, dict) or not isinstance(email.get("body_paragraphs"), list):
+        return None
+    return email
+
+@dataclass(frozen=True, slots=True)
+class EmailParts:
+    """A generated email reduced to what the output writers need."""
+    subject: str
+    team_members: List[str]
+    # (is_bullet, [(text, bold), ...]) for each body paragraph
+    paragraphs: List[Tuple[bool, List[Tuple[str, bool]]]]
+
+def _parse_generated_email(email_content: str, buyer_info: Dict[str, Any]) -> EmailParts:
+    """
+    Reduce a generated email to its subject, team members and body paragraphs.
+    
+    Content that is not a structured email (e.g. an error message) becomes
+    plain paragraphs under the default subject.
+    """
+    email = _parse_email_response(email_content)
+    if email is None:
+        return EmailParts(
+            subject=_DEFAULT_SUBJECT,
+            team_members=[str(member) for member in buyer_info['contacts']],
+            paragraphs=[(False, [(text, False)]) for text in _RE_PARAGRAPH_BREAK.split(email_content.strip())]
+        )
+    
+    # Parsed contacts take precedence over the team members in the generated email
+    team_members = buyer_info['contacts'] or email.get("team_members", [])
+    paragraphs = []
+    for paragraph in email["body_paragraphs"]:
+        runs = [(str(run.get("text", "")), bool(run.get("bold"))) for run in paragraph.get("runs", [])]
+        paragraphs.append((paragraph.get("type") == "bullet", runs))
+    return EmailParts(
+        subject=str(email.get("subject") or "").strip() or _DEFAULT_SUBJECT,
+        team_members=[str(member) for member in team_members],
+        paragraphs=paragraphs
+    )
+
+
+# Reasoning files larger than this (bytes) are parsed without loading them whole
+_STREAM_READ_THRESHOLD = 64 * 1024
+
+# Section headers in reasoning files, mapped to the collector that captures them
+_SECTION_HEADERS = (
+    ("contact", "CONTACT INFORMATION"),
+    ("final", "FINAL ASSESSMENT"),
+    ("analysis", "ANALYSIS PROCESS"),
+)
+_TEAM_HEADER = "Key Team Members"
+
+def _is_rule(line: str, char: str) -> bool:
+    """Return True if a line is a non-empty run of a single rule character."""
+    return bool(line) and line.strip(char) == ""
+
+def _ends_section(name: str, line: str) -> bool:
+    """Return True if a line closes the given section."""
+    if name == "contact":
+        return line.startswith("=")
+    if name == "final":
+        return line.startswith("=") or line.startswith("CONTACT")
+    if name == "analysis":
+        return line.startswith("FINAL ASSESSMENT")
+    # Key Team Members ends at a blank line or a rule
+    return line == "" or line.startswith("=")
+
+def _scan_reasoning_lines(lines: Iterable[str]) -> Dict[str, Any]:
+    """
+    Collect the header fields and sections of a reasoning file in one pass.
+    
+    Sections are captured on their first complete occurrence: CONTACT
+    INFORMATION (between '=' rules), FINAL ASSESSMENT and ANALYSIS PROCESS
+    (after a '-' rule) and Key Team Members (up to a blank line or rule).
+    Sections may overlap, e.g. the FINAL ASSESSMENT header closes ANALYSIS PROCESS.
+    Email addresses anywhere in the file are collected along the way.
+    
+    Args:
+        lines: Lines of the reasoning file, without trailing newlines
+        
+    Returns:
+        Dictionary with company_name, url, contact, team, final and analysis
+        values, or None for anything not found, and the list of emails
+    """
+    found: Dict[str, Any] = {
+        "company_name": None, "url": None,
+        "contact": None, "team": None, "final": None, "analysis": None,
+    }
+    emails: List[str] = []
+    # Section name -> [state, captured lines]; state is "rule", "start" or "collect"
+    active: Dict[str, List[Any]] = {}
+    pending_field = None
+    
+    for line in lines:
+        # Emails never span lines; the '@' check skips the regex on most lines
+        if '@' in line:
+            emails.extend(_RE_EMAIL.findall(line))
+        
+        # Advance sections that are already open
+        for name, (state, captured) in list(active.items()):
+            if state == "rule":
+                # Header must be followed by a rule line, otherwise keep looking
+                rule_char = "=" if name == "contact" else "-"
+                if _is_rule(line, rule_char):
+                    active[name][0] = "collect"
+                else:
+                    del active[name]
+            elif state == "start":
+                # Blank lines directly after the team header are skipped
+                if line.strip():
+                    active[name][0] = "collect"
+                    captured.append(line)
+            elif captured and _ends_section(name, line):
+                # Like the original patterns, the first body line never ends a section
+                found[name] = "\n".join(captured)
+                del active[name]
+            else:
+                captured.append(line)
+        
+        # Open new sections
+        for name, header in _SECTION_HEADERS:
+            if found[name] is None and name not in active and line.endswith(header):
+                active[name] = ["rule", []]
+        if found["team"] is None and "team" not in active and _TEAM_HEADER in line:
+            if line.partition(_TEAM_HEADER)[2].strip(": \t") == "":
+                active["team"] = ["start", []]
+        
+        # Company and URL values may continue onto the next non-blank line
+        if pending_field is not None:
+            if line.strip():
+                value = line.lstrip()
+                found[pending_field] = value if pending_field == "company_name" else value.split()[0]
+                pending_field = None
+            continue
+        for field, label in (("company_name", "Company:"), ("url", "URL:")):
+            if found[field] is None and label in line:
+                value = line.partition(label)[2].lstrip()
+                if not value.strip():
+                    pending_field = field
+                elif field == "company_name":
+                    found[field] = value
+                else:
+                    found[field] = value.split()[0]
+                break
+    
+    found["emails"] = emails
+    return found
+
+def _large_file_indexes(files: List[Dict[str, Any]]) -> set:
+    """Return the indexes of files too large to read whole; unreadable files count as small."""
+    large = set()
+    for index, file_info in enumerate(files):
+        try:
+            if os.stat(file_info['path']).st_size > _STREAM_READ_THRESHOLD:
+                large.add(index)
+        except OSError:
+            pass
+    return large
+
+def extract_buyer_info_from_file(file_path: Path) -> Dict[str, Any]:
+    """
+    Extract relevant buyer information from a reasoning file.
+    
+    Defined at module level so it can run in a process pool.
+    
+    Args:
+        file_path: Path to the reasoning file
+        
+    Returns:
+        Dictionary with extracted information
+    """
+    try:
+        file_path = Path(file_path)
+        
+        # Scan the lines once for every field and section. Large files are streamed
+        # line by line rather than held as both the text and its list of lines.
+        if file_path.stat().st_size > _STREAM_READ_THRESHOLD:
+            content = None
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                sections = _scan_reasoning_lines(line.rstrip('\n') for line in f)
+        else:
+            content = file_path.read_text(encoding='utf-8', errors='replace')
+            lines = content.split('\n')
+            if lines[-1] == '':
+                lines.pop()
+            sections = _scan_reasoning_lines(lines)
+        
+        # Extract company name
+        company_name = sections["company_name"] or "Unknown Company"
+        
+        # Extract URL - updated to be more reliable
+        url = sections["url"].strip() if sections["url"] else f"{company_name}.com"
+        
+        # If URL is somehow wrong, try to fix it
+        if not url or url == "4.5M" or not _RE_VALID_DOMAIN.match(url):
+            url = f"{company_name}.com"
+        
+        # Extract contact information using multiple patterns
+        contacts = []
+        
+        # Try to find contacts in the CONTACT INFORMATION section
+        contact_text = sections["contact"]
+        if contact_text is not None and "No contact information found" not in contact_text:
+            contact_lines = [line.strip() for line in contact_text.split('\n') if line.strip()]
+            contacts.extend(contact_lines)
+        
+        # Also look for Key Team Members section with emails
+        if sections["team"] is not None:
+            team_text = sections["team"].strip()
+            team_lines = [line.strip() for line in team_text.split('\n') if line.strip() and '|' in line]
+            contacts.extend(team_lines)
+        
+        # Fall back to emails anywhere in the document if we still don't have any
+        if not contacts:
+            email_matches = sections["emails"]
+            if email_matches:
+                # Deduplicate in order of appearance so the contact list is stable across runs
+                unique_emails = list(dict.fromkeys(email_matches))
+                if content is None:
+                    content = file_path.read_text(encoding='utf-8', errors='replace')
+                name_email_matches = _RE_NAME_EMAIL.findall(content)
+                
+                if name_email_matches:
+                    contacts = [f"{name.strip()} | Email: {email.strip()}" for name, email in name_email_matches]
+                else:
+                    # Just list the emails if we can't associate names
+                    contacts = [f"Contact: {email}" for email in unique_emails]
+        
+        # Extract reasoning from final assessment
+        final_assessment = (sections["final"] or "").strip()
+        
+        # Extract any other relevant sections for the email
+        analysis_process = (sections["analysis"] or "").strip()
+        
+        return {
+            "company_name": company_name,
+            "url": url,
+            "contacts": contacts,
+            "final_assessment": final_assessment,
+            "analysis_process": analysis_process,
+            "content_path": file_path
+        }
+        
+    except Exception as e:
+        logger.error(f"Error extracting buyer info from {file_path}: {str(e)}")
+        return {
+            "company_name": "Error",
+            "url": "Error",
+            "contacts": [],
+            "final_assessment": "",
+            "analysis_process": "",
+            "content_path": Path(file_path)
+        }
+
 class EmailAgent:
     """
     Agent for generating personalized emails based on reasoning outputs.
     """
     
-    def __init__(self, template_path=None, output_dir=None):
+    def __init__(self, template_path=None, output_dir=None, output_format=None):
         """Initialize the email agent."""
         if not API_KEY:
             raise ValueError("Google API key not found. Please set the GOOGLE_API_KEY environment variable.")
@@ -56,17 +427,44 @@ class EmailAgent:
             generation_config={
                 "temperature": TEMPERATURE,
                 "max_output_tokens": MAX_OUTPUT_TOKENS,
+                # Return the email as structured JSON so it needs no markdown parsing
+                "response_mime_type": "application/json",
+                "response_schema": EmailResponse,
             }
         )
         
         # Use custom template path if provided
-        self.template_path = template_path if template_path else EMAIL_TEMPLATE_PATH
+        self.template_path = template_path if template_path else get_email_template_path()
         logger.info(f"Using template path: {self.template_path}")
         
+        # Template message part and request digest, loaded once and reloaded if the file changes
+        self._template_part = None
+        self._template_mtime = None
+        self._prompt_digest = None
+        try:
+            self._get_template_part()
+        except ValueError:
+            # Already logged; a missing template is reported again with each email
+            pass
+        
         # Use custom output directory if provided
-        self.output_dir = output_dir if output_dir else OUTPUT_DIR
+        self.output_dir = output_dir if output_dir else get_output_dir()
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # Output format for generated emails: Word documents or plain-text .eml drafts
+        self.output_format = output_format if output_format else OUTPUT_FORMAT
+        if self.output_format not in ("docx", "eml"):
+            raise ValueError(f"Unsupported output format: {self.output_format}")
+        
+        # Caches of generated emails so re-runs over unchanged profiles skip Gemini:
+        # exact content-hash files first, then the semantic cache
+        self._cache_dir = self.output_dir / ".email_cache"
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self.semantic_cache = SemanticCache(
+            self._cache_dir / "semantic_cache.sqlite",
+            threshold=SEMANTIC_CACHE_THRESHOLD
+        )
+        
         logger.info(f"Initialized EmailAgent with model: {MODEL_ID}")
     
     def list_strong_buyer_files(self) -> List[Dict[str, Any]]:
@@ -77,47 +475,43 @@ class EmailAgent:
             List of dictionaries with file information
         """
         files = []
+        reasoning_dir = get_reasoning_dir()
         
         try:
-            logger.info(f"Looking for files in: {REASONING_DIR}")
-            logger.info(f"Directory exists: {REASONING_DIR.exists()}")
-            logger.info(f"Directory is a directory: {REASONING_DIR.is_dir()}")
-            
-            # List all files in the directory for debugging
-            all_files = list(REASONING_DIR.glob("*"))
-            logger.info(f"All files in directory ({len(all_files)}): {[f.name for f in all_files]}")
+            logger.info(f"Looking for files in: {reasoning_dir}")
             
-            # Get all files in the reasoning output directory
+            # Scan the reasoning output directory once, stopping at the email limit
             pattern = f"{BUYER_PREFIX}*.txt"
             logger.info(f"Looking for pattern: {pattern}")
-            matching_files = list(REASONING_DIR.glob(pattern))
-            logger.info(f"Found {len(matching_files)} matching files")
-            
-            # Process all found files
-            for file_path in matching_files:
-                # Extract company name from filename
-                filename = file_path.name
-                company_name_match = re.search(r'(?:STRONG|Strong|strong)_(?:buyer_)?(.+?)_reasoning_', filename, re.IGNORECASE)
-                
-                if company_name_match:
-                    company_name = company_name_match.group(1)
+            with os.scandir(reasoning_dir) as entries:
+                for entry in entries:
+                    filename = entry.name
+                    # is_file() uses the type cached by scandir, so this adds no stat call
+                    if not (filename.startswith(BUYER_PREFIX) and filename.endswith('.txt') and entry.is_file()):
+                        continue
                     
-                    files.append({
-                        "path": str(file_path),  # Convert Path to string
-                        "company_name": company_name,
-                        "filename": filename,
-                        "processed": False,
-                        "success": None,
-                        "output_file": None,
-                        "error": None
-                    })
+                    # Extract company name from filename
+                    company_name_match = _RE_BUYER_FILENAME.search(filename)
+                    if company_name_match:
+                        company_name = company_name_match.group(1)
+                        
+                        files.append({
+                            "path": Path(entry.path),
+                            "company_name": company_name,
+                            "filename": filename,
+                            "processed": False,
+                            "success": None,
+                            "output_file": None,
+                            "error": None,
+                            "skipped": False
+                        })
+                        
+                        # Limit the number of files if needed
+                        if len(files) >= MAX_EMAILS_TO_GENERATE:
+                            logger.warning(f"Limiting to {MAX_EMAILS_TO_GENERATE} files")
+                            break
             
             logger.info(f"Found {len(files)} strong buyer files to process")
-            
-            # Limit the number of files if needed
-            if len(files) > MAX_EMAILS_TO_GENERATE:
-                logger.warning(f"Limiting to {MAX_EMAILS_TO_GENERATE} files")
-                files = files[:MAX_EMAILS_TO_GENERATE]
                 
             return files
             
@@ -135,84 +529,7 @@ class EmailAgent:
         Returns:
             Dictionary with extracted information
         """
-        try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-            
-            # Extract company name
-            company_name_match = re.search(r'Company:\s*(.+?)\n', content)
-            company_name = company_name_match.group(1) if company_name_match else "Unknown Company"
-            
-            # Extract URL - updated to be more reliable
-            url_match = re.search(r'URL:\s*([^\s]+)', content)
-            url = url_match.group(1).strip() if url_match else f"{company_name}.com"
-            
-            # If URL is somehow wrong, try to fix it
-            if not url or url == "4.5M" or not re.match(r'^[a-zA-Z0-9][-a-zA-Z0-9.]*\.[a-zA-Z]{2,}$', url):
-                url = f"{company_name}.com"
-            
-            # Extract contact information using multiple patterns
-            contacts = []
-            
-            # Try to find contacts in the CONTACT INFORMATION section
-            contact_section = re.search(r'CONTACT INFORMATION\n=+\n(.*?)\n=+', content, re.DOTALL)
-            if contact_section and "No contact information found" not in contact_section.group(1):
-                contact_text = contact_section.group(1)
-                contact_lines = [line.strip() for line in contact_text.split('\n') if line.strip()]
-                contacts.extend(contact_lines)
-            
-            # Also look for Key Team Members section with emails
-            team_section = re.search(r'Key Team Members[:\s]*\n(.*?)(?:\n\n|\n=+)', content, re.DOTALL)
-            if team_section:
-                team_text = team_section.group(1).strip()
-                team_lines = [line.strip() for line in team_text.split('\n') if line.strip() and '|' in line]
-                contacts.extend(team_lines)
-            
-            # Look for emails in the entire document if we still don't have any
-            if not contacts:
-                email_matches = re.findall(r'([a-zA-Z0-9._-]+@[a-zA-Z0-9._-]+\.[a-zA-Z0-9_-]+)', content)
-                if email_matches:
-                    unique_emails = list(set(email_matches))
-                    name_email_pattern = r'([A-Za-z\s.]+)(?:\([^)]+\))?\s*\|?\s*Email:\s*([a-zA-Z0-9._-]+@[a-zA-Z0-9._-]+\.[a-zA-Z0-9_-]+)'
-                    name_email_matches = re.findall(name_email_pattern, content)
-                    
-                    if name_email_matches:
-                        contacts = [f"{name.strip()} | Email: {email.strip()}" for name, email in name_email_matches]
-                    else:
-                        # Just list the emails if we can't associate names
-                        contacts = [f"Contact: {email}" for email in unique_emails]
-            
-            # Extract reasoning from final assessment
-            final_assessment = ""
-            final_section = re.search(r'FINAL ASSESSMENT\n-+\n(.*?)\n(?:=+|CONTACT)', content, re.DOTALL)
-            if final_section:
-                final_assessment = final_section.group(1).strip()
-            
-            # Extract any other relevant sections for the email
-            analysis_process = ""
-            analysis_section = re.search(r'ANALYSIS PROCESS\n-+\n(.*?)\nFINAL ASSESSMENT', content, re.DOTALL)
-            if analysis_section:
-                analysis_process = analysis_section.group(1).strip()
-            
-            return {
-                "company_name": company_name,
-                "url": url,
-                "contacts": contacts,
-                "final_assessment": final_assessment,
-                "analysis_process": analysis_process,
-                "full_content": content
-            }
-            
-        except Exception as e:
-            logger.error(f"Error extracting buyer info from {file_path}: {str(e)}")
-            return {
-                "company_name": "Error",
-                "url": "Error",
-                "contacts": [],
-                "final_assessment": "",
-                "analysis_process": "",
-                "full_content": f"Error: {str(e)}"
-            }
+        return extract_buyer_info_from_file(file_path)
     
     def encode_image(self, image_path: Path) -> str:
         """
@@ -229,211 +546,641 @@ class EmailAgent:
             return ""
         
         try:
-            with open(image_path, "rb") as image_file:
-                return base64.b64encode(image_file.read()).decode('utf-8')
+            return base64.b64encode(image_path.read_bytes()).decode('utf-8')
         except Exception as e:
             logger.error(f"Error encoding image: {str(e)}")
             return ""
     
-    def generate_email(self, buyer_info: Dict[str, Any]) -> str:
+    def embed_text(self, text: str) -> List[float]:
         """
-        Generate a personalized email using the Gemini model.
+        Embed text with the Gemini embedding model.
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Embedding vector
+        """
+        return genai.embed_content(model=EMBEDDING_MODEL_ID, content=text)["embedding"]
+    
+    async def embed_text_async(
+        self,
+        text: str,
+        semaphore: asyncio.Semaphore,
+        rate_limiter: RateLimiter
+    ) -> List[float]:
+        """
+        Embed text within the same concurrency and quota limits as generation requests.
+        
+        Args:
+            text: Text to embed
+            semaphore: Bounds the number of in-flight Gemini requests
+            rate_limiter: Throttles requests to the provider quota
+            
+        Returns:
+            Embedding vector
+        """
+        async with semaphore:
+            await rate_limiter.acquire(len(text) // 4)
+            return await asyncio.to_thread(self.embed_text, text)
+    
+    def read_buyer_profile(self, buyer_info: Dict[str, Any]) -> str:
+        """
+        Read the reasoning file behind a buyer profile.
+        
+        The profile text is only loaded while its request is being built, so
+        queued buyers hold a path rather than a copy of the file.
         
         Args:
             buyer_info: Dictionary with buyer information
             
         Returns:
-            Generated email content
+            Full reasoning file content
+        """
+        return Path(buyer_info['content_path']).read_text(encoding='utf-8', errors='replace')
+    
+    def _get_template_part(self) -> Dict[str, Any]:
+        """
+        Return the template message part, re-reading the file only when it changes.
+        
+        Returns:
+            Gemini message part holding the template text or base64 image
         """
         try:
-            # Prepare prompt with buyer information
-            prompt = EMAIL_PROMPT
-            
-            # Create message parts
-            parts = [{"text": prompt}]
+            mtime = self.template_path.stat().st_mtime_ns
+            if self._template_part is not None and mtime == self._template_mtime:
+                return self._template_part
             
-            # Check if the template is an image or text file
+            template_bytes = self.template_path.read_bytes()
             if self.template_path.suffix.lower() in ['.jpg', '.jpeg', '.png', '.gif']:
                 # Handle image template
-                template_image_b64 = self.encode_image(self.template_path)
-                if not template_image_b64:
-                    raise ValueError(f"Failed to encode template image at {self.template_path}")
-                
-                parts.append({
+                template_part = {
                     "inline_data": {
                         "mime_type": f"image/{self.template_path.suffix.lower().lstrip('.')}",
-                        "data": template_image_b64
+                        "data": base64.b64encode(template_bytes).decode('utf-8')
                     }
-                })
+                }
             else:
                 # Handle text template (assume it's a text file)
-                try:
-                    with open(self.template_path, 'r') as f:
-                        template_text = f.read()
-                    parts.append({"text": f"Email Template:\n\n{template_text}"})
-                except Exception as e:
-                    logger.error(f"Error reading template file: {e}")
-                    raise ValueError(f"Failed to read template file at {self.template_path}")
+                template_part = {"text": f"Email Template:\n\n{template_bytes.decode('utf-8')}"}
+        except Exception as e:
+            logger.error(f"Error reading template file: {e}")
+            raise ValueError(f"Failed to read template file at {self.template_path}")
+        
+        # Template and prompt are fixed between template edits, so hash them once per load
+        self._prompt_digest = hashlib.sha256(template_bytes + EMAIL_PROMPT.encode('utf-8')).digest()
+        self._template_part = template_part
+        self._template_mtime = mtime
+        return template_part
+    
+    def _cache_key(self, content: str) -> str:
+        """
+        Hash the full request inputs: buyer profile, template and prompt.
+        
+        Args:
+            content: Full reasoning file content
+            
+        Returns:
+            Hex SHA-256 digest identifying the request
+        """
+        self._get_template_part()
+        return hashlib.sha256(
+            self._prompt_digest + content.encode('utf-8')
+        ).hexdigest()
+    
+    def _semantic_key(self, buyer_info: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Company name, URL and prompt digest that a semantic cache entry must match."""
+        self._get_template_part()
+        return buyer_info['company_name'], buyer_info['url'], self._prompt_digest.hex()
+    
+    def _read_exact_cache(self, content: str) -> Optional[str]:
+        """Return the email cached for exactly this request, or None."""
+        cache_file = self._cache_dir / f"{self._cache_key(content)}.txt"
+        if cache_file.exists():
+            return cache_file.read_text(encoding='utf-8')
+        return None
+    
+    def _write_exact_cache(self, content: str, email_content: str) -> None:
+        """Store an email under the exact request hash."""
+        # Write to a temporary file and rename so readers never see a partial entry
+        cache_file = self._cache_dir / f"{self._cache_key(content)}.txt"
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_file.write_text(email_content, encoding='utf-8')
+        os.replace(tmp_file, cache_file)
+    
+    def _lookup_semantic(self, buyer_info: Dict[str, Any], embedding: List[float]) -> Optional[str]:
+        """Look up the semantic cache, ignoring emails cached before structured output."""
+        cached = self.semantic_cache.lookup(*self._semantic_key(buyer_info), embedding)
+        # Emails cached before structured output are markdown; regenerate those
+        if cached is not None and _parse_email_response(cached) is None:
+            return None
+        return cached
+    
+    def get_cached_email(
+        self, buyer_info: Dict[str, Any], content: str
+    ) -> Tuple[Optional[str], Optional[List[float]]]:
+        """
+        Look up a previously generated email for an identical or equivalent buyer profile.
+        
+        The profile is embedded once, for the semantic lookup, and the same vector
+        is returned so a miss can be cached without embedding it again.
+        
+        Args:
+            buyer_info: Dictionary with buyer information
+            content: Full reasoning file content
             
-            # Add buyer information
-            parts.append({"text": "Buyer profile information:\n" + buyer_info['full_content']})
+        Returns:
+            Cached email content (None on a miss or cache failure) and the profile
+            embedding (None on an exact hit or if embedding failed)
+        """
+        try:
+            cached = self._read_exact_cache(content)
+            if cached is not None:
+                logger.info(f"Exact cache hit for {buyer_info['company_name']}")
+                return cached, None
             
-            # Create the template content
-            template_content = {
-                "role": "user",
-                "parts": parts
-            }
+            embedding = self.embed_text(content)
+            return self._lookup_semantic(buyer_info, embedding), embedding
+        except Exception as e:
+            logger.warning(f"Email cache lookup failed: {str(e)}")
+            return None, None
+    
+    async def get_cached_email_async(
+        self,
+        buyer_info: Dict[str, Any],
+        content: str,
+        semaphore: asyncio.Semaphore,
+        rate_limiter: RateLimiter
+    ) -> Tuple[Optional[str], Optional[List[float]]]:
+        """
+        Look up a cached email, embedding the profile within the request limits.
+        
+        Args:
+            buyer_info: Dictionary with buyer information
+            content: Full reasoning file content
+            semaphore: Bounds the number of in-flight Gemini requests
+            rate_limiter: Throttles requests to the provider quota
             
-            # Generate response
+        Returns:
+            Cached email content (None on a miss or cache failure) and the profile
+            embedding (None on an exact hit or if embedding failed)
+        """
+        try:
+            cached = await asyncio.to_thread(self._read_exact_cache, content)
+            if cached is not None:
+                logger.info(f"Exact cache hit for {buyer_info['company_name']}")
+                return cached, None
+            
+            embedding = await self.embed_text_async(content, semaphore, rate_limiter)
+            cached = await asyncio.to_thread(self._lookup_semantic, buyer_info, embedding)
+            return cached, embedding
+        except Exception as e:
+            logger.warning(f"Email cache lookup failed: {str(e)}")
+            return None, None
+    
+    def cache_email(
+        self,
+        buyer_info: Dict[str, Any],
+        content: str,
+        email_content: str,
+        embedding: Optional[List[float]]
+    ) -> None:
+        """
+        Store a generated email in the exact and semantic caches.
+        
+        Args:
+            buyer_info: Dictionary with buyer information
+            content: Full reasoning file content
+            email_content: Generated email content
+            embedding: Profile embedding from the lookup; without one only the exact cache is written
+        """
+        try:
+            self._write_exact_cache(content, email_content)
+            if embedding is not None:
+                self.semantic_cache.store(
+                    *self._semantic_key(buyer_info), content, embedding, email_content
+                )
+        except Exception as e:
+            logger.warning(f"Email cache store failed: {str(e)}")
+    
+    async def cache_email_async(
+        self,
+        buyer_info: Dict[str, Any],
+        content: str,
+        email_content: str,
+        embedding: Optional[List[float]]
+    ) -> None:
+        """
+        Store a generated email without blocking the event loop.
+        
+        Args:
+            buyer_info: Dictionary with buyer information
+            content: Full reasoning file content
+            email_content: Generated email content
+            embedding: Profile embedding from the lookup; without one only the exact cache is written
+        """
+        await asyncio.to_thread(self.cache_email, buyer_info, content, email_content, embedding)
+    
+    @staticmethod
+    def format_buyer_profile(buyer_info: Dict[str, Any]) -> str:
+        """
+        Format the parsed buyer fields as a compact profile for the prompt.
+        
+        Args:
+            buyer_info: Dictionary with buyer information
+            
+        Returns:
+            Profile text with the company, contacts, assessment and analysis
+        """
+        contacts = "\n".join(f"- {contact}" for contact in buyer_info['contacts']) or "None found"
+        return (
+            f"Company: {buyer_info['company_name']}\n"
+            f"URL: {buyer_info['url']}\n"
+            f"Contacts:\n{contacts}\n\n"
+            f"Assessment:\n{buyer_info['final_assessment']}\n\n"
+            f"Analysis:\n{buyer_info['analysis_process']}"
+        )
+    
+    def build_request(self, buyer_info: Dict[str, Any], content: str) -> Dict[str, Any]:
+        """
+        Build the Gemini request content for a buyer.
+        
+        Args:
+            buyer_info: Dictionary with buyer information
+            content: Full reasoning file content
+            
+        Returns:
+            Request content with the prompt, template and buyer profile parts
+        """
+        # The prompt and template come first and are identical for every buyer, so
+        # Gemini's implicit prefix caching can reuse them across requests. Keep
+        # anything that varies per buyer after them.
+        parts = [_PROMPT_PART, self._get_template_part()]
+        
+        # Add buyer information
+        parts.append({"text": "Buyer profile information:\n" + self._profile_text(buyer_info, content)})
+        
+        # Create the template content
+        return {
+            "role": "user",
+            "parts": parts
+        }
+    
+    def build_group_request(self, buyer_infos: List[Dict[str, Any]], contents: List[str]) -> Dict[str, Any]:
+        """
+        Build one Gemini request asking for an independent email per buyer.
+        
+        Args:
+            buyer_infos: Buyer information dictionaries
+            contents: Full reasoning file content for each buyer
+            
+        Returns:
+            Request content with the shared prompt and template, then each buyer profile
+        """
+        count = len(buyer_infos)
+        parts = [
+            _PROMPT_PART,
+            self._get_template_part(),
+            {"text": (
+                f"There are {count} buyer profiles below. Write one independent email for each buyer "
+                f"and respond with a JSON array of exactly {count} emails, in the same order as the profiles."
+            )},
+        ]
+        for number, (buyer_info, content) in enumerate(zip(buyer_infos, contents), start=1):
+            parts.append({"text": f"Buyer profile {number} information:\n" + self._profile_text(buyer_info, content)})
+        
+        return {
+            "role": "user",
+            "parts": parts
+        }
+    
+    def _profile_text(self, buyer_info: Dict[str, Any], content: str) -> str:
+        """Return the profile sent for a buyer, falling back to the whole file when parsing found too little."""
+        if len(buyer_info['final_assessment']) < PROFILE_FALLBACK_MIN_CHARS:
+            return content
+        return self.format_buyer_profile(buyer_info)
+    
+    @staticmethod
+    def estimate_tokens(request: Dict[str, Any], output_tokens: int = MAX_OUTPUT_TOKENS) -> int:
+        """
+        Roughly estimate the tokens a request will consume for rate limiting.
+        
+        Args:
+            request: Request content from build_request
+            output_tokens: Output token budget of the request
+            
+        Returns:
+            Estimated prompt tokens (about 4 characters each) plus the output budget
+        """
+        prompt_chars = sum(len(part.get("text", "")) for part in request["parts"])
+        return prompt_chars // 4 + output_tokens
+    
+    def generate_email(self, buyer_info: Dict[str, Any]) -> str:
+        """
+        Generate a personalized email using the Gemini model.
+        
+        Args:
+            buyer_info: Dictionary with buyer information
+            
+        Returns:
+            Generated email content
+        """
+        try:
+            content = self.read_buyer_profile(buyer_info)
+            cached, embedding = self.get_cached_email(buyer_info, content)
+            if cached is not None:
+                return cached
+            
+            template_content = self.build_request(buyer_info, content)
+            
+            # Generate response, backing off on rate limits and transient errors
             logger.info(f"Generating email for {buyer_info['company_name']}")
-            response = self.model.generate_content([template_content])
+            for attempt in range(API_MAX_ATTEMPTS):
+                try:
+                    response = self.model.generate_content([template_content])
+                    break
+                except _RETRYABLE_ERRORS as e:
+                    if attempt == API_MAX_ATTEMPTS - 1:
+                        raise
+                    delay = API_RETRY_BASE_DELAY * 2 ** attempt
+                    logger.warning(f"Gemini request failed ({str(e)}), retrying in {delay:.0f}s")
+                    time.sleep(delay)
             
             if not response or not response.text:
                 raise ValueError("Empty response from Gemini API")
             
+            self.cache_email(buyer_info, content, response.text, embedding)
             return response.text
             
         except Exception as e:
             logger.error(f"Error generating email: {str(e)}")
-            return f"Error generating email: {str(e)}"
+            return f"{_GENERATION_ERROR_PREFIX}{str(e)}"
     
-    def save_email_as_docx(self, email_content: str, buyer_info: Dict[str, Any]) -> Optional[Path]:
+    async def generate_email_async(
+        self,
+        buyer_info: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        rate_limiter: RateLimiter
+    ) -> str:
         """
-        Save generated email as a Word document with proper formatting.
+        Generate a personalized email without blocking the event loop.
         
         Args:
-            email_content: The generated email content
-            buyer_info: Buyer information dictionary
+            buyer_info: Dictionary with buyer information
+            semaphore: Bounds the number of in-flight Gemini requests
+            rate_limiter: Throttles requests to the provider quota
             
         Returns:
-            Path to the saved document or None if failed
+            Generated email content
         """
         try:
-            # Create a new document
-            doc = Document()
+            content = await asyncio.to_thread(self.read_buyer_profile, buyer_info)
+            cached, embedding = await self.get_cached_email_async(buyer_info, content, semaphore, rate_limiter)
+            if cached is not None:
+                return cached
             
-            # Add metadata section at top
-            doc.add_heading("META INFORMATION", level=1)
+            template_content = self.build_request(buyer_info, content)
             
-            # Add URL with proper formatting
-            url_para = doc.add_paragraph()
-            url_para.add_run("URL: ").bold = True
+            email_content = await self._generate_content_async(
+                template_content, semaphore, rate_limiter, buyer_info['company_name']
+            )
             
-            # Ensure URL is not "4.5M" and is a valid domain
-            url = buyer_info['url']
-            if not url or url == "4.5M" or not re.match(r'^[a-zA-Z0-9][-a-zA-Z0-9.]*\.[a-zA-Z]{2,}$', url):
-                url = f"{buyer_info['company_name']}.com"
+            await self.cache_email_async(buyer_info, content, email_content, embedding)
+            return email_content
             
-            url_para.add_run(url)
+        except Exception as e:
+            logger.error(f"Error generating email: {str(e)}")
+            return f"{_GENERATION_ERROR_PREFIX}{str(e)}"
+    
+    async def generate_email_group_async(
+        self,
+        buyer_infos: List[Dict[str, Any]],
+        semaphore: asyncio.Semaphore,
+        rate_limiter: RateLimiter
+    ) -> List[str]:
+        """
+        Generate emails for several buyers with a single Gemini request.
+        
+        Cached buyers are served from the cache. Any email missing or malformed
+        in the grouped response is regenerated with its own request.
+        
+        Args:
+            buyer_infos: Buyer information dictionaries
+            semaphore: Bounds the number of in-flight Gemini requests
+            rate_limiter: Throttles requests to the provider quota
             
-            # Add team members with proper formatting and bullet points
-            team_para = doc.add_paragraph()
-            team_para.add_run("Team Members:").bold = True
+        Returns:
+            Generated email content for each buyer, in input order
+        """
+        if len(buyer_infos) == 1:
+            return [await self.generate_email_async(buyer_infos[0], semaphore, rate_limiter)]
+        
+        results: List[Optional[str]] = [None] * len(buyer_infos)
+        contents: Dict[int, str] = {}
+        embeddings: Dict[int, Optional[List[float]]] = {}
+        try:
+            for index, buyer_info in enumerate(buyer_infos):
+                content = await asyncio.to_thread(self.read_buyer_profile, buyer_info)
+                results[index], embedding = await self.get_cached_email_async(
+                    buyer_info, content, semaphore, rate_limiter
+                )
+                if results[index] is None:
+                    contents[index] = content
+                    embeddings[index] = embedding
+            
+            if len(contents) > 1:
+                misses = list(contents)
+                request = self.build_group_request(
+                    [buyer_infos[index] for index in misses], [contents[index] for index in misses]
+                )
+                label = f"{len(misses)} buyers ({', '.join(buyer_infos[index]['company_name'] for index in misses)})"
+                response_text = await self._generate_content_async(
+                    request, semaphore, rate_limiter, label,
+                    generation_config={
+                        "response_schema": List[EmailResponse],
+                        "max_output_tokens": MAX_OUTPUT_TOKENS * len(misses),
+                    }
+                )
+                emails = orjson.loads(response_text)
+                if isinstance(emails, list):
+                    for index, email in zip(misses, emails):
+                        if isinstance(email, dict) and isinstance(email.get("body_paragraphs"), list):
+                            results[index] = orjson.dumps(email).decode('utf-8')
+                            await self.cache_email_async(
+                                buyer_infos[index], contents[index], results[index], embeddings[index]
+                            )
+        except Exception as e:
+            logger.warning(f"Grouped email generation failed, falling back to one request per buyer: {str(e)}")
+        
+        # Regenerate anything the grouped request did not return
+        missing = [index for index, email in enumerate(results) if email is None]
+        regenerated = await asyncio.gather(
+            *(self.generate_email_async(buyer_infos[index], semaphore, rate_limiter) for index in missing)
+        )
+        for index, email_content in zip(missing, regenerated):
+            results[index] = email_content
+        return results
+    
+    async def _generate_content_async(
+        self,
+        request: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        rate_limiter: RateLimiter,
+        label: str,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Send a request within the concurrency and quota limits, retrying transient errors.
+        
+        Args:
+            request: Request content from build_request or build_group_request
+            semaphore: Bounds the number of in-flight Gemini requests
+            rate_limiter: Throttles requests to the provider quota
+            label: Description of the request for logging
+            generation_config: Overrides of the model's generation settings
             
-            # Process contact information
-            if buyer_info['contacts']:
-                for contact in buyer_info['contacts']:
-                    contact_para = doc.add_paragraph(style='ListBullet')
-                    contact_para.add_run(contact)
-            else:
-                # Extract team information from the generated email
-                team_section = re.search(r'\*\*Team Members:\*\*(.*?)(?:\*\*Subject:|$)', email_content, re.DOTALL)
-                if team_section:
-                    team_text = team_section.group(1).strip()
-                    
-                    # Process each team member line
-                    for line in team_text.split('\n'):
-                        if line.strip() and (line.strip().startswith('*') or line.strip().startswith('•')):
-                            contact_para = doc.add_paragraph(style='ListBullet')
-                            contact_para.add_run(line.strip().replace('* ', '').replace('• ', ''))
-            
-            # Add horizontal line
-            doc.add_paragraph("─" * 50)
-            
-            # Extract and format the actual email content
-            email_body = email_content
-            
-            # Remove the metadata section if it exists in the email content
-            url_pattern = r'\*\*URL:\*\*.*?\n'
-            team_pattern = r'\*\*Team Members:\*\*.*?(?=\*\*Subject:|$)'
-            
-            email_body = re.sub(url_pattern, '', email_body, flags=re.DOTALL)
-            email_body = re.sub(team_pattern, '', email_body, flags=re.DOTALL)
-            
-            # Extract subject line
-            subject_match = re.search(r'\*\*Subject:(.*?)\*\*', email_body)
-            if subject_match:
-                subject = subject_match.group(1).strip()
-                email_body = re.sub(r'\*\*Subject:.*?\*\*', '', email_body, flags=re.DOTALL)
-            else:
-                subject = "Project Elevate: Premier Parking Lift Distributor Buyout Opportunity"
+        Returns:
+            Response text
+        """
+        output_tokens = (generation_config or {}).get("max_output_tokens", MAX_OUTPUT_TOKENS)
+        estimated_tokens = self.estimate_tokens(request, output_tokens)
+        
+        # Back off on rate limits and transient errors; the concurrency slot is
+        # released while waiting to retry
+        for attempt in range(API_MAX_ATTEMPTS):
+            try:
+                async with semaphore:
+                    await rate_limiter.acquire(estimated_tokens)
+                    logger.info(f"Generating email for {label}")
+                    response = await self.model.generate_content_async(
+                        [request], generation_config=generation_config
+                    )
+                break
+            except _RETRYABLE_ERRORS as e:
+                if attempt == API_MAX_ATTEMPTS - 1:
+                    raise
+                delay = API_RETRY_BASE_DELAY * 2 ** attempt
+                logger.warning(f"Gemini request failed ({str(e)}), retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+        
+        if not response or not response.text:
+            raise ValueError("Empty response from Gemini API")
+        return response.text
+    
+    @staticmethod
+    def _output_name(company_name: str) -> str:
+        """Return the company name as used in output filenames."""
+        return company_name.replace('/', '_').replace('\\', '_')
+    
+    def _output_path(self, buyer_info: Dict[str, Any], suffix: str) -> Path:
+        """Return a timestamped output file path for a buyer's email."""
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        return self.output_dir / f"Email_{self._output_name(buyer_info['company_name'])}_{timestamp}{suffix}"
+    
+    def existing_output_names(self) -> set:
+        """
+        Collect the companies that already have an email in the configured output format.
+        
+        Outputs that hold an error message instead of an email are ignored.
+        
+        Returns:
+            Set of company names as they appear in output filenames
+        """
+        suffix = f".{self.output_format}"
+        names = set()
+        try:
+            with os.scandir(self.output_dir) as entries:
+                for entry in entries:
+                    match = _RE_OUTPUT_FILENAME.match(entry.name)
+                    # Files written from a failed generation do not count, so the buyer is retried
+                    if match and match.group(2) == suffix and _output_holds_email(Path(entry.path)):
+                        names.add(match.group(1))
+        except OSError as e:
+            logger.warning(f"Could not list existing outputs: {str(e)}")
+        return names
+    
+    def save_email(self, email_content: str, buyer_info: Dict[str, Any]) -> Optional[Path]:
+        """
+        Save a generated email in the agent's output format.
+        
+        Args:
+            email_content: The generated email JSON
+            buyer_info: Buyer information dictionary
             
-            # Add the subject as a heading
-            doc.add_heading(subject, level=1)
+        Returns:
+            Path to the saved file or None if failed
+        """
+        if self.output_format == "eml":
+            return self.save_email_as_eml(email_content, buyer_info)
+        return self.save_email_as_docx(email_content, buyer_info)
+    
+    def save_email_as_eml(self, email_content: str, buyer_info: Dict[str, Any]) -> Optional[Path]:
+        """
+        Save generated email as a plain-text .eml draft addressed to the buyer's contacts.
+        
+        Args:
+            email_content: The generated email JSON
+            buyer_info: Buyer information dictionary
             
-            # Split into paragraphs
-            paragraphs = re.split(r'\n\s*\n', email_body.strip())
+        Returns:
+            Path to the saved draft or None if failed
+        """
+        try:
+            parts = _parse_generated_email(email_content, buyer_info)
+            
+            # Address the draft to every email found in the team members
+            recipients = dict.fromkeys(
+                address for member in parts.team_members for address in _RE_EMAIL.findall(member)
+            )
+            
+            # Flatten the body to plain text, marking bullet paragraphs
+            paragraphs = []
+            for is_bullet, runs in parts.paragraphs:
+                text = "".join(text for text, _ in runs)
+                paragraphs.append(f"• {text}" if is_bullet else text)
+            body = "\n\n".join(paragraphs)
+            
+            message = EmailMessage()
+            if recipients:
+                message["To"] = ", ".join(recipients)
+            message["Subject"] = parts.subject
+            message["X-Unsent"] = "1"  # Open as an editable draft in Outlook
+            message.set_content(body)
+            
+            output_file = self._output_path(buyer_info, ".eml")
+            output_file.write_bytes(message.as_bytes())
+            logger.info(f"Saved email to {output_file}")
             
-            for paragraph in paragraphs:
-                # Handle bullet point sections differently
-                if '•' in paragraph or '*' in paragraph:
-                    # Split by newlines to process each bullet point 
-                    lines = paragraph.split('\n')
-                    
-                    for line in lines:
-                        line = line.strip()
-                        if not line:
-                            continue
-                            
-                        if line.startswith('•') or line.startswith('*'):
-                            # This is a bullet point
-                            bullet_para = doc.add_paragraph(style='ListBullet')
-                            
-                            # Extract the bullet text without the bullet symbol
-                            bullet_text = re.sub(r'^[•*]\s*', '', line)
-                            
-                            # Look for bold text patterns and apply formatting
-                            if '**' in bullet_text:
-                                # Process bold text within the bullet point
-                                parts = re.split(r'(\*\*.*?\*\*)', bullet_text)
-                                for part in parts:
-                                    if part.startswith('**') and part.endswith('**'):
-                                        # This is bold text
-                                        bold_text = part.strip('*')
-                                        run = bullet_para.add_run(bold_text)
-                                        run.bold = True
-                                    else:
-                                        bullet_para.add_run(part)
-                            else:
-                                # No formatting needed
-                                bullet_para.add_run(bullet_text)
-                        else:
-                            # Regular text within a bullet point section
-                            doc.add_paragraph(line)
-                else:
-                    # Regular paragraph
-                    p = doc.add_paragraph()
-                    
-                    # Look for bold text with ** markers
-                    if '**' in paragraph:
-                        parts = re.split(r'(\*\*.*?\*\*)', paragraph)
-                        for part in parts:
-                            if part.startswith('**') and part.endswith('**'):
-                                # This is bold text
-                                bold_text = part.strip('*')
-                                run = p.add_run(bold_text)
-                                run.bold = True
-                            else:
-                                p.add_run(part)
-                    else:
-                        # No formatting needed
-                        p.add_run(paragraph)
+            return output_file
             
-            # Save document
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            company_name = buyer_info['company_name'].replace('/', '_').replace('\\', '_')
-            output_file = self.output_dir / f"Email_{company_name}_{timestamp}.docx"
+        except Exception as e:
+            logger.error(f"Error saving email as .eml draft: {str(e)}")
+            return None
+    
+    def save_email_as_docx(self, email_content: str, buyer_info: Dict[str, Any]) -> Optional[Path]:
+        """
+        Save generated email as a Word document with proper formatting.
+        
+        Args:
+            email_content: The generated email JSON
+            buyer_info: Buyer information dictionary
             
+        Returns:
+            Path to the saved document or None if failed
+        """
+        try:
+            # python-docx is only loaded once a Word document is actually written
+            from backend.email_agent.docx_writer import build_email_document
+            
+            # Ensure URL is not "4.5M" and is a valid domain
+            url = buyer_info['url']
+            if not url or url == "4.5M" or not _RE_VALID_DOMAIN.match(url):
+                url = f"{buyer_info['company_name']}.com"
+            
+            doc = build_email_document(url, _parse_generated_email(email_content, buyer_info))
+            
+            # Save document
+            output_file = self._output_path(buyer_info, ".docx")
             doc.save(output_file)
             logger.info(f"Saved email to {output_file}")
             
@@ -456,25 +1203,29 @@ class EmailAgent:
         try:
             logger.info(f"Processing file: {file_info['filename']}")
             
-            # If path is a string, convert to Path
-            file_path = file_info['path']
-            if isinstance(file_path, str):
-                file_path = Path(file_path)
-            
             # Extract buyer information
-            buyer_info = self.extract_buyer_info(file_path)
+            buyer_info = self.extract_buyer_info(file_info['path'])
             
             # Generate email
             email_content = self.generate_email(buyer_info)
+            if _is_generation_error(email_content):
+                # Nothing is saved, so the next run generates this buyer again
+                file_info.update({
+                    "processed": True,
+                    "success": False,
+                    "output_file": None,
+                    "error": email_content
+                })
+                return file_info
             
-            # Save as Word document
-            output_file = self.save_email_as_docx(email_content, buyer_info)
+            # Save in the configured output format
+            output_file = self.save_email(email_content, buyer_info)
             
             # Update file information
             file_info.update({
                 "processed": True,
                 "success": output_file is not None,
-                "output_file": str(output_file) if output_file else None,  # Convert Path to string
+                "output_file": os.fspath(output_file) if output_file else None,  # Convert Path to string
                 "error": None
             })
             
@@ -492,6 +1243,169 @@ class EmailAgent:
             
             return file_info
     
+    async def process_files_async(
+        self,
+        files: List[Dict[str, Any]],
+        concurrency: Optional[int] = None,
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Process files as a three-stage pipeline: parse -> generate -> save.
+        
+        Each stage has its own workers and the stages are connected by bounded
+        queues, so parsing (threads, or processes for large files), Gemini
+        calls (rate limited) and output saving (threads) overlap across files.
+        When EMAILS_PER_REQUEST is above 1, buyers waiting in the queue are
+        grouped into one request.
+        Can be awaited from an existing event loop, e.g. an API handler.
+        
+        Args:
+            files: File information dictionaries from list_strong_buyer_files
+            concurrency: Maximum in-flight Gemini requests (defaults to MAX_CONCURRENT_REQUESTS)
+            on_result: Optional callback invoked with each file's information as soon as it is saved
+                (or skipped because its email already exists)
+            
+        Returns:
+            Processed file information dictionaries, in input order
+        """
+        concurrency = concurrency or MAX_CONCURRENT_REQUESTS
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+        rate_limiter = RateLimiter(REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE)
+        
+        pending: asyncio.Queue = asyncio.Queue()
+        for index in range(len(files)):
+            pending.put_nowait(index)
+        extracted: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        generated: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        
+        # Never start more extraction workers than there are files to parse
+        extract_workers = max(1, min(EXTRACTION_WORKERS or os.cpu_count() or 1, len(files)))
+        generate_workers = concurrency
+        save_workers = SAVE_WORKERS
+        
+        # Outputs are listed once; buyers found in this set never reach Gemini
+        existing = self.existing_output_names() if SKIP_EXISTING_OUTPUTS else set()
+        
+        async def extract_stage(pool: Optional[ProcessPoolExecutor]) -> None:
+            while True:
+                try:
+                    index = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                buyer_info = await loop.run_in_executor(
+                    pool if index in large_files else None,
+                    extract_buyer_info_from_file, files[index]['path']
+                )
+                # Placeholder names from failed parses never count as already generated
+                company_name = buyer_info['company_name']
+                if company_name not in ("Error", "Unknown Company") and self._output_name(company_name) in existing:
+                    logger.info(f"Email already exists for {company_name}, skipping")
+                    files[index].update({
+                        "processed": True,
+                        "success": True,
+                        "output_file": None,
+                        "error": None,
+                        "skipped": True
+                    })
+                    if on_result is not None:
+                        on_result(files[index])
+                    continue
+                await extracted.put((index, buyer_info))
+        
+        async def generate_stage() -> None:
+            finished = False
+            while not finished and (item := await extracted.get()) is not None:
+                # Group buyers that are already waiting into one request, without
+                # holding back a buyer to fill a group
+                batch = [item]
+                while len(batch) < EMAILS_PER_REQUEST:
+                    try:
+                        item = extracted.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if item is None:
+                        finished = True
+                        break
+                    batch.append(item)
+                emails = await self.generate_email_group_async(
+                    [buyer_info for _, buyer_info in batch], semaphore, rate_limiter
+                )
+                for (index, buyer_info), email_content in zip(batch, emails):
+                    await generated.put((index, buyer_info, email_content))
+        
+        async def save_stage() -> None:
+            while (item := await generated.get()) is not None:
+                index, buyer_info, email_content = item
+                file_info = files[index]
+                if _is_generation_error(email_content):
+                    # Nothing is saved, so the next run generates this buyer again
+                    file_info.update({
+                        "processed": True,
+                        "success": False,
+                        "output_file": None,
+                        "error": email_content
+                    })
+                    if on_result is not None:
+                        on_result(file_info)
+                    continue
+                try:
+                    output_file = await loop.run_in_executor(
+                        save_pool, self.save_email, email_content, buyer_info
+                    )
+                    file_info.update({
+                        "processed": True,
+                        "success": output_file is not None,
+                        "output_file": os.fspath(output_file) if output_file else None,  # Convert Path to string
+                        "error": None
+                    })
+                except Exception as e:
+                    logger.error(f"Error processing file {file_info['filename']}: {str(e)}")
+                    file_info.update({
+                        "processed": True,
+                        "success": False,
+                        "output_file": None,
+                        "error": str(e)
+                    })
+                if on_result is not None:
+                    on_result(file_info)
+        
+        # Small files parse in less time than a worker process takes to start, so they
+        # are parsed in threads. Only files too large to read whole go to a process
+        # pool, sized to them, whose workers log through the listener's queue.
+        large_files = await asyncio.to_thread(_large_file_indexes, files)
+        process_workers = min(extract_workers, len(large_files))
+        pool = None
+        if process_workers > 1:
+            worker_logging = {}
+            if _log_queue is not None:
+                worker_logging = {
+                    "initializer": _init_worker_logging,
+                    "initargs": (_log_queue, logging.getLogger().level)
+                }
+            pool = ProcessPoolExecutor(max_workers=process_workers, **worker_logging)
+        # Output files are written on dedicated threads so they never queue behind cache lookups
+        save_pool = ThreadPoolExecutor(max_workers=save_workers, thread_name_prefix="email-save")
+        try:
+            async with asyncio.TaskGroup() as group:
+                extractors = [group.create_task(extract_stage(pool)) for _ in range(extract_workers)]
+                generators = [group.create_task(generate_stage()) for _ in range(generate_workers)]
+                savers = [group.create_task(save_stage()) for _ in range(save_workers)]
+                
+                # Shut each stage down once the one feeding it has drained
+                await asyncio.gather(*extractors)
+                for _ in generators:
+                    await extracted.put(None)
+                await asyncio.gather(*generators)
+                for _ in savers:
+                    await generated.put(None)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            save_pool.shutdown()
+        
+        return files
+    
     def run(self, single_file=None) -> Dict[str, Any]:
         """
         Run the email generation process for all strong buyer files or a single file.
@@ -502,6 +1416,8 @@ class EmailAgent:
         Returns:
             Dictionary with results and statistics
         """
+        # Callers that embed the agent get the same log file and worker logging as main()
+        configure_logging()
         logger.info("Starting email generation process")
         
         # Check if we're processing just a single file
@@ -516,9 +1432,11 @@ class EmailAgent:
                 }
             
             # Create file info for the single file
-            company_name = single_file_path.stem.split('_')[1]  # Assuming format STRONG_companyname_...
+            # Same filename pattern as list_strong_buyer_files (STRONG_[buyer_]companyname_reasoning_...)
+            company_name_match = _RE_BUYER_FILENAME.search(single_file_path.name)
+            company_name = company_name_match.group(1) if company_name_match else single_file_path.stem
             file_info = {
-                "path": str(single_file_path),  # Convert Path to string
+                "path": single_file_path,
                 "company_name": company_name,
                 "filename": single_file_path.name,
                 "processed": False,
@@ -536,6 +1454,9 @@ class EmailAgent:
             
             logger.info(f"Single file processing complete. Success: {result['success']}")
             
+            # Paths are only converted to strings for the JSON-facing result
+            result["path"] = os.fspath(result["path"])
+            
             return {
                 "status": "complete",
                 "results": [result],
@@ -554,41 +1475,40 @@ class EmailAgent:
                 "stats": {"total": 0, "processed": 0, "successful": 0, "failed": 0}
             }
         
-        # Process each file
-        results = []
-        stats = {"total": len(files), "processed": 0, "successful": 0, "failed": 0}
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        # Output paths are built as strings once; they are reported, not manipulated
+        results_file = os.path.join(self.output_dir, f"email_generation_results_{timestamp}.jsonl")
+        summary_file = os.path.join(self.output_dir, f"email_generation_summary_{timestamp}.json")
+        stats = {"total": len(files), "processed": 0, "successful": 0, "failed": 0, "skipped": 0}
         
-        for file_info in files:
-            # Convert Path to string to ensure JSON serialization works
-            if isinstance(file_info["path"], Path):
-                file_info["path"] = str(file_info["path"])
-            
-            # Process the file
-            result = self.process_file(file_info)
-            
-            # Ensure output_file is a string for JSON serialization
-            if result["output_file"] and isinstance(result["output_file"], Path):
-                result["output_file"] = str(result["output_file"])
-            
-            # Update statistics
-            stats["processed"] += 1
-            if result["success"]:
-                stats["successful"] += 1
-            else:
-                stats["failed"] += 1
+        # Stream each result to a JSON Lines file as soon as its email is saved
+        with open(results_file, 'wb') as results_out:
+            def record_result(result: Dict[str, Any]) -> None:
+                # Ensure paths are strings for JSON serialization
+                result["path"] = os.fspath(result["path"])
+                
+                # Update statistics
+                stats["processed"] += 1
+                if result["success"]:
+                    stats["successful"] += 1
+                else:
+                    stats["failed"] += 1
+                if result.get("skipped"):
+                    stats["skipped"] += 1
+                
+                results_out.write(orjson.dumps(result, default=str) + b"\n")  # default=str handles any other non-serializable objects
+                results_out.flush()
             
-            # Add to results
-            results.append(result)
-        
-        # Save summary
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        summary_file = self.output_dir / f"email_generation_summary_{timestamp}.json"
+            # Process the files through the parse -> generate -> save pipeline
+            logger.info(f"Processing {len(files)} files with up to {MAX_CONCURRENT_REQUESTS} concurrent requests")
+            results = asyncio.run(self.process_files_async(files, on_result=record_result))
         
-        with open(summary_file, "w") as f:
-            json.dump({
+        # Save summary; the per-file results live in the JSON Lines file
+        with open(summary_file, 'wb') as summary_out:
+            summary_out.write(orjson.dumps({
                 "stats": stats,
-                "results": results
-            }, f, indent=2, default=str)  # Use default=str to handle any other non-serializable objects
+                "results_file": results_file
+            }, option=orjson.OPT_INDENT_2))
         
         logger.info(f"Email generation complete. Stats: {stats}")
         
@@ -596,5 +1516,6 @@ class EmailAgent:
             "status": "complete",
             "results": results,
             "stats": stats,
-            "summary_file": str(summary_file)  # Convert Path to string
+            "summary_file": summary_file,
+            "results_file": results_file
         } 
\ No newline at end of file
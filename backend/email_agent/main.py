@@ -8,18 +8,10 @@ import os
 import sys
 import logging
 import argparse
-from backend.email_agent.email_agent import EmailAgent
-from backend.email_agent.config import OUTPUT_DIR, EMAIL_TEMPLATE_PATH
+from backend.email_agent.email_agent import EmailAgent, configure_logging, stop_logging
+from backend.email_agent.config import get_output_dir, get_email_template_path
 from pathlib import Path
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-    ]
-)
 logger = logging.getLogger(__name__)
 
 def parse_args():
@@ -28,7 +20,7 @@ def parse_args():
     
     parser.add_argument(
         "--output-dir",
-        help=f"Output directory for email documents (default: {OUTPUT_DIR})"
+        help="Output directory for email documents (default: email_agent/output)"
     )
     
     parser.add_argument(
@@ -47,25 +39,41 @@ def parse_args():
         help="Path to the email template image"
     )
     
+    parser.add_argument(
+        "--format",
+        choices=["docx", "eml"],
+        help="Output format for generated emails (default: docx)"
+    )
+    
     return parser.parse_args()
 
 def main():
     """Main entry point for the email agent."""
     args = parse_args()
     
+    # Configure logging; the listener is stopped on exit so queued records are written
+    configure_logging()
+    try:
+        return run(args)
+    finally:
+        stop_logging()
+
+def run(args):
+    """Generate emails as configured by the command line arguments."""
     # Set log level
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
         logger.debug("Debug mode enabled")
     
     # Create custom output directory if specified
-    output_dir = OUTPUT_DIR
     if args.output_dir:
         output_dir = Path(args.output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
+    else:
+        output_dir = get_output_dir()
     
     # Use custom template path if specified
-    template_path = EMAIL_TEMPLATE_PATH
+    template_path = get_email_template_path()
     if args.template:
         template_path = Path(args.template)
         if not template_path.exists():
@@ -75,7 +83,7 @@ def main():
     logger.info("Starting email generation process...")
     
     # Create and run the email agent
-    agent = EmailAgent(template_path=template_path, output_dir=output_dir)
+    agent = EmailAgent(template_path=template_path, output_dir=output_dir, output_format=args.format)
     
     # Run with single file if specified
     if args.single_file:
@@ -88,9 +96,13 @@ def main():
     logger.info(f"  Total files: {result['stats']['total']}")
     logger.info(f"  Successfully processed: {result['stats']['successful']}")
     logger.info(f"  Failed: {result['stats']['failed']}")
+    if result['stats'].get('skipped'):
+        logger.info(f"  Skipped (email already exists): {result['stats']['skipped']}")
     
     if 'summary_file' in result:
         logger.info(f"Summary saved to: {result['summary_file']}")
+    if 'results_file' in result:
+        logger.info(f"Results saved to: {result['results_file']}")
     
     return 0 if result['stats']['failed'] == 0 else 1
 
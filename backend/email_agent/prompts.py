@@ -1,21 +1,46 @@
 """
 Email Generation Prompts.
 
-This module contains prompt templates for email generation.
+This module contains prompt templates for email generation and the schema
+of the structured email Gemini returns.
 """
 
+from typing import List, TypedDict
+
+
+class EmailRun(TypedDict):
+    """A span of paragraph text with its formatting."""
+    text: str
+    bold: bool
+
+
+class EmailParagraph(TypedDict):
+    """A body paragraph; type is "bullet" for bullet points, otherwise "text"."""
+    type: str
+    runs: List[EmailRun]
+
+
+class EmailResponse(TypedDict):
+    """Structured email returned by Gemini."""
+    url: str
+    team_members: List[str]
+    subject: str
+    body_paragraphs: List[EmailParagraph]
+
+
 EMAIL_PROMPT = """
 Using the template attached, please create a professional and clear email to the buyer (attached buyer profile). For quality control, please only change the text in the bracket [] of the template. If there is no suitable content in the attached buyer profile file, then delete the bullet.
 
-IMPORTANT FORMATTING REQUIREMENTS:
-1. First line with **URL:** followed by the company's URL exactly as shown in the profile (e.g., "envestcap.com")
-2. Section with **Team Members:** followed by bullet points for each team member WITH THEIR EMAIL if available (one per line, use * at the start of each line)
-   - Example: * John Smith (Managing Director) | Email: jsmith@example.com
-3. Line with **Subject:** followed by the subject line
-4. In the email body:
-   - Keep bold formatting using ** around text that should be bold (e.g., **Industry Alignment:** should remain bold)
-   - For bullet points, use the • symbol with NO EXTRA SPACES after the bullet (e.g., •Industry Alignment: not • Industry Alignment:)
-   - Make sure bullet points are tight with no extra spaces in front of the text
+IMPORTANT OUTPUT REQUIREMENTS:
+Respond with a JSON object with these fields:
+1. "url": the company's URL exactly as shown in the profile (e.g., "envestcap.com")
+2. "team_members": one entry for each team member WITH THEIR EMAIL if available
+   - Example: "John Smith (Managing Director) | Email: jsmith@example.com"
+3. "subject": the subject line
+4. "body_paragraphs": the email body, one entry per paragraph in order, each with:
+   - "type": "bullet" for bullet points, otherwise "text"
+   - "runs": the paragraph text split into runs, with "bold": true for text that should be bold (e.g., "Industry Alignment:" should remain bold) and false otherwise
+   - Do not include bullet symbols or ** markers in the run text, and do not start bullet text with spaces
 
 -Make sure to emphasize the reasoning on why attached buyer is a strong potential buyer (which is listed in the attached file), but caveate the reasonings with words such as "could" or "likely" or "appears to".  But do not caveats on statements factual statements about the target company, e.g. "The business seems to be profitable and cash-generative, consistent with your preferences" is wrong, it should be "The business is profitable and cash-generative, and seems to be consistent with your preferences"
 -Do not explicitly mention target company's EBITDA Multiple or implied multiple, and never mention the value/price of the Target company we are selling.
@@ -24,7 +49,7 @@ IMPORTANT FORMATTING REQUIREMENTS:
 
 ATTENTION: Make sure to include all team member emails that are present in the profile!
 
-Sample format:
+Sample format (** marks bold runs and • marks bullet paragraphs):
 **URL:** envestcap.com
 
 **Team Members:**
@@ -0,0 +1,65 @@
+"""
+Email Agent Rate Limiting.
+
+This module contains a token-bucket limiter used to keep concurrent LLM
+requests within the provider's requests-per-minute and tokens-per-minute quotas.
+"""
+
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter for requests-per-minute and tokens-per-minute quotas.
+    
+    Both buckets start full and refill continuously. acquire() waits until a
+    request slot and the estimated token budget are available, so calls are
+    throttled before they are sent rather than retried after a 429.
+    """
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """Initialize the limiter with per-minute quotas."""
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._available_requests = float(requests_per_minute)
+        self._available_tokens = float(tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        """Add capacity for the time elapsed since the last refill."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._available_requests = min(
+            self.requests_per_minute,
+            self._available_requests + elapsed * self.requests_per_minute / 60
+        )
+        self._available_tokens = min(
+            self.tokens_per_minute,
+            self._available_tokens + elapsed * self.tokens_per_minute / 60
+        )
+    
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until one request and the given number of tokens can be spent.
+        
+        Args:
+            tokens: Estimated tokens (prompt + completion) for the request
+        """
+        # A single request can never need more than a full bucket
+        tokens = min(tokens, self.tokens_per_minute)
+        
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._available_requests >= 1 and self._available_tokens >= tokens:
+                    self._available_requests -= 1
+                    self._available_tokens -= tokens
+                    return
+                
+                # Sleep until the scarcer bucket has refilled enough
+                request_wait = (1 - self._available_requests) * 60 / self.requests_per_minute
+                token_wait = (tokens - self._available_tokens) * 60 / self.tokens_per_minute
+                await asyncio.sleep(max(request_wait, token_wait, 0.01))
@@ -0,0 +1,168 @@
+"""
+Test module for reasoning file extraction.
+
+This module checks that the single-pass line scanner extracts the same buyer
+information as the regular expressions it replaced.
+"""
+
+import unittest
+import os
+import sys
+import random
+import re
+import tempfile
+import logging
+from pathlib import Path
+from unittest.mock import patch
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Add parent directory to path so we can import the email agent module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+# Import the module to test
+from backend.email_agent.email_agent import extract_buyer_info_from_file
+
+# Patterns used by extract_buyer_info before the line scanner
+_RE_COMPANY = re.compile(r'Company:\s*(.+?)\n')
+_RE_URL = re.compile(r'URL:\s*([^\s]+)')
+_RE_VALID_DOMAIN = re.compile(r'^[a-zA-Z0-9][-a-zA-Z0-9.]*\.[a-zA-Z]{2,}$')
+_RE_CONTACT_SECTION = re.compile(r'CONTACT INFORMATION\n=+\n(.*?)\n=+', re.DOTALL)
+_RE_TEAM_SECTION = re.compile(r'Key Team Members[:\s]*\n(.*?)(?:\n\n|\n=+)', re.DOTALL)
+_RE_EMAIL = re.compile(r'([a-zA-Z0-9._-]+@[a-zA-Z0-9._-]+\.[a-zA-Z0-9_-]+)')
+_RE_NAME_EMAIL = re.compile(r'([A-Za-z\s.]+)(?:\([^)]+\))?\s*\|?\s*Email:\s*([a-zA-Z0-9._-]+@[a-zA-Z0-9._-]+\.[a-zA-Z0-9_-]+)')
+_RE_FINAL_SECTION = re.compile(r'FINAL ASSESSMENT\n-+\n(.*?)\n(?:=+|CONTACT)', re.DOTALL)
+_RE_ANALYSIS_SECTION = re.compile(r'ANALYSIS PROCESS\n-+\n(.*?)\nFINAL ASSESSMENT', re.DOTALL)
+
+# Building blocks for generated reasoning files, including the edge cases
+# where a section's first body line looks like its terminator
+_BLOCKS = [
+    "Company: Acme Capital\n",
+    "URL: acme.com\n",
+    "Company:\n  Beta Partners\n",
+    "URL:   \n www.beta.io\n",
+    "ANALYSIS PROCESS\n-----\nThinking hard\nmore\n\n",
+    "ANALYSIS PROCESS\n-----\nFINAL ASSESSMENT is next\nmore\n",
+    "FINAL ASSESSMENT\n-----\nStrong buyer because\nreasons\n",
+    "FINAL ASSESSMENT\n-----\nCONTACT the partners first\nthen more\n",
+    "FINAL ASSESSMENT\n-----\n=== fit score ===\nthen more\n",
+    "FINAL ASSESSMENT\n-----\n\nCONTACT\n",
+    "CONTACT INFORMATION\n=====\nJohn Doe CEO john@acme.com\nJane jane@acme.com\n=====\n",
+    "CONTACT INFORMATION\n=====\n=====\nJohn\n=====\n",
+    "CONTACT INFORMATION\n=====\n\n=====\n",
+    "CONTACT INFORMATION\n=====\nNo contact information found.\n\n=====\n",
+    "Key Team Members:\n\nJohn Smith | Email: js@x.com\nBob | MD\n\n",
+    "Key Team Members\nA | b\n=====\n",
+    "Key Team Members:\n=====\nC | d\n\n",
+    "random text with mail z@q.org here\n",
+    "Mr. Name Person (MD) | Email: np@firm.com\n",
+    "==========\n",
+    "-----\n",
+    "\n",
+    "blah CONTACT info\n",
+    "FINAL ASSESSMENT\nno rule here\n",
+]
+
+
+def regex_extract(content: str) -> dict:
+    """Extract buyer information the way extract_buyer_info did with regular expressions."""
+    company_name_match = _RE_COMPANY.search(content)
+    company_name = company_name_match.group(1) if company_name_match else "Unknown Company"
+
+    url_match = _RE_URL.search(content)
+    url = url_match.group(1).strip() if url_match else f"{company_name}.com"
+    if not url or url == "4.5M" or not _RE_VALID_DOMAIN.match(url):
+        url = f"{company_name}.com"
+
+    contacts = []
+    contact_section = _RE_CONTACT_SECTION.search(content)
+    if contact_section and "No contact information found" not in contact_section.group(1):
+        contacts.extend(line.strip() for line in contact_section.group(1).split('\n') if line.strip())
+
+    team_section = _RE_TEAM_SECTION.search(content)
+    if team_section:
+        team_text = team_section.group(1).strip()
+        contacts.extend(line.strip() for line in team_text.split('\n') if line.strip() and '|' in line)
+
+    if not contacts:
+        email_matches = _RE_EMAIL.findall(content)
+        if email_matches:
+            name_email_matches = _RE_NAME_EMAIL.findall(content)
+            if name_email_matches:
+                contacts = [f"{name.strip()} | Email: {email.strip()}" for name, email in name_email_matches]
+            else:
+                contacts = [f"Contact: {email}" for email in set(email_matches)]
+
+    final_section = _RE_FINAL_SECTION.search(content)
+    analysis_section = _RE_ANALYSIS_SECTION.search(content)
+    return {
+        "company_name": company_name,
+        "url": url,
+        "contacts": contacts,
+        "final_assessment": final_section.group(1).strip() if final_section else "",
+        "analysis_process": analysis_section.group(1).strip() if analysis_section else "",
+    }
+
+
+class TestExtractBuyerInfo(unittest.TestCase):
+    """Parity tests between the line scanner and the original regular expressions."""
+
+    def setUp(self):
+        """Set up a scratch directory for reasoning files."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        """Clean up the scratch directory."""
+        self._tmp.cleanup()
+
+    def assert_parity(self, content: str, streamed: bool = False):
+        """Check that the scanner and the regular expressions agree on one file."""
+        file_path = self.tmp_dir / "STRONG_buyer_Test_reasoning_1.txt"
+        file_path.write_text(content, encoding='utf-8')
+        threshold = -1 if streamed else 64 * 1024
+        with patch('backend.email_agent.email_agent._STREAM_READ_THRESHOLD', threshold):
+            actual = extract_buyer_info_from_file(file_path)
+        expected = regex_extract(content)
+
+        self.assertEqual(actual["content_path"], file_path)
+        for field in ("company_name", "url", "final_assessment", "analysis_process"):
+            self.assertEqual(actual[field], expected[field], f"{field} differs for {content!r}")
+        # Fallback emails are deduplicated in a stable order now, so compare as multisets
+        self.assertCountEqual(actual["contacts"], expected["contacts"], f"contacts differ for {content!r}")
+
+    def test_first_body_line_never_ends_section(self):
+        """Test that a first body line starting with a terminator is part of the section."""
+        content = (
+            "Company: Acme Capital\n"
+            "FINAL ASSESSMENT\n-----\nCONTACT the partners before the close\nStrong fit\n"
+            "CONTACT INFORMATION\n=====\n=====\nJane Doe | Email: jane@acme.com\n=====\n"
+        )
+        self.assert_parity(content)
+        info = extract_buyer_info_from_file(self.tmp_dir / "STRONG_buyer_Test_reasoning_1.txt")
+        self.assertEqual(info["final_assessment"], "CONTACT the partners before the close\nStrong fit")
+        self.assertEqual(info["contacts"], ["=====", "Jane Doe | Email: jane@acme.com"])
+
+        logger.info("Successfully tested first body line handling")
+
+    def test_blank_first_body_line_ends_at_next_terminator(self):
+        """Test that a blank first body line lets the next line close the section."""
+        self.assert_parity("FINAL ASSESSMENT\n-----\n\nCONTACT INFORMATION\n=====\n\n=====\n")
+
+        logger.info("Successfully tested blank first body line")
+
+    def test_generated_files_match_regex_extraction(self):
+        """Test parity on randomly assembled reasoning files, read whole and streamed."""
+        rng = random.Random(1)
+        for case in range(500):
+            content = "".join(rng.choice(_BLOCKS) for _ in range(rng.randint(0, 12)))
+            self.assert_parity(content, streamed=case % 2 == 1)
+
+        logger.info("Successfully tested extraction parity on generated files")
+
+
+# Run the tests if this file is executed directly
+if __name__ == "__main__":
+    unittest.main()
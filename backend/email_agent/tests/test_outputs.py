@@ -0,0 +1,112 @@
+"""
+Test module for email agent outputs.
+
+This module checks that failed generations are reported as failures and never
+saved as emails, so later runs with SKIP_EXISTING_OUTPUTS retry those buyers.
+"""
+
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+import logging
+from pathlib import Path
+from unittest.mock import patch
+
+import orjson
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Add parent directory to path so we can import the email agent module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+# Import the module to test
+from backend.email_agent.email_agent import EmailAgent
+
+_EMAIL = orjson.dumps({
+    "url": "acme.com",
+    "team_members": [],
+    "subject": "Hello",
+    "body_paragraphs": [{"type": "paragraph", "runs": [{"text": "Hi there", "bold": False}]}],
+}).decode('utf-8')
+
+
+class TestEmailOutputs(unittest.TestCase):
+    """Test cases for saving emails and detecting existing outputs."""
+
+    def setUp(self):
+        """Set up reasoning files, a template and an agent writing .eml drafts."""
+        self._tmp = tempfile.TemporaryDirectory()
+        tmp_dir = Path(self._tmp.name)
+        self.reasoning_dir = tmp_dir / "reasoning"
+        self.reasoning_dir.mkdir()
+        for name in ("Acme", "Beta"):
+            (self.reasoning_dir / f"STRONG_buyer_{name}_reasoning_1.txt").write_text(
+                f"Company: {name}\nURL: {name.lower()}.com\nFINAL ASSESSMENT\n-----\nStrong fit\n=====\n"
+            )
+        template_path = tmp_dir / "template.txt"
+        template_path.write_text("Template")
+
+        patches = [
+            patch('backend.email_agent.email_agent.API_KEY', 'test_key'),
+            patch('backend.email_agent.email_agent.get_reasoning_dir', return_value=self.reasoning_dir),
+            patch('backend.email_agent.email_agent.EXTRACTION_WORKERS', 1),
+            patch.object(EmailAgent, 'embed_text', return_value=[1.0, 0.0]),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+        self.agent = EmailAgent(template_path=template_path, output_dir=tmp_dir / "output", output_format="eml")
+
+    def tearDown(self):
+        """Clean up the scratch directory."""
+        self._tmp.cleanup()
+
+    def run_pipeline(self, generate):
+        """Run the pipeline over the reasoning files with a stubbed Gemini request."""
+        with patch.object(EmailAgent, '_generate_content_async', generate):
+            return asyncio.run(self.agent.process_files_async(self.agent.list_strong_buyer_files()))
+
+    def test_failed_generation_is_not_saved(self):
+        """Test that a failed request is recorded as a failure and retried on the next run."""
+        async def fail(*args, **kwargs):
+            raise RuntimeError("429 Resource exhausted")
+
+        async def succeed(*args, **kwargs):
+            return _EMAIL
+
+        results = self.run_pipeline(fail)
+
+        # Verify nothing was written and the error is reported
+        self.assertTrue(all(not result["success"] for result in results))
+        self.assertTrue(all(result["output_file"] is None for result in results))
+        self.assertIn("429 Resource exhausted", results[0]["error"])
+        self.assertEqual(list(self.agent.output_dir.glob("Email_*")), [])
+
+        # Verify the next run generates both buyers instead of skipping them
+        results = self.run_pipeline(succeed)
+        self.assertTrue(all(result["success"] and not result.get("skipped") for result in results))
+        self.assertEqual(self.agent.existing_output_names(), {"Acme", "Beta"})
+
+        logger.info("Successfully tested failed generation handling")
+
+    def test_existing_outputs_ignore_saved_errors(self):
+        """Test that outputs holding an error message do not count as generated emails."""
+        self.agent.save_email(_EMAIL, {"company_name": "Acme", "url": "acme.com", "contacts": []})
+        self.agent.save_email(
+            "Error generating email: 503 Service unavailable",
+            {"company_name": "Beta", "url": "beta.com", "contacts": []}
+        )
+
+        self.assertEqual(self.agent.existing_output_names(), {"Acme"})
+
+        logger.info("Successfully tested existing output detection")
+
+
+# Run the tests if this file is executed directly
+if __name__ == "__main__":
+    unittest.main()
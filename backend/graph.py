@@ -3,25 +3,42 @@ from langgraph.graph import StateGraph, add_messages, END
 from langgraph.checkpoint.memory import MemorySaver
 from backend.orchestrator_agent.orchestrator import Orchestrator, orchestrator_action, orchestrator_router
 from backend.reasoning_agent.reasoning import Reasoning, ReasoningOrchestrator, reasoning_completion
-from backend.reasoning_agent.config import CONFIG as REASONING_CONFIG
+from backend.reasoning_agent.config import CONFIG as REASONING_CONFIG, NUM_REASONING_AGENTS
 from langchain_openai import ChatOpenAI
+from langchain_core.messages import AIMessageChunk, HumanMessage
 from typing_extensions import Annotated, TypedDict
 import asyncio
 from typing import List, Optional
 import operator
 import logging
+import queue
+import atexit
+from logging.handlers import QueueHandler, QueueListener
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('graph.log')
-    ]
-)
+# Configure logging: records are handed to a queue and written by a background
+# listener, so workflow creation and agent dispatch never block on console or file I/O.
+# The agent modules imported above may already have configured the root logger;
+# their handlers move behind the same listener alongside graph.log.
+_log_format = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_root_logger = logging.getLogger()
+_log_handlers = _root_logger.handlers[:] or [logging.StreamHandler()]
+_log_handlers.append(logging.FileHandler('graph.log', delay=True))
+for _handler in _log_handlers:
+    if _handler.formatter is None:
+        _handler.setFormatter(_log_format)
+_log_queue = queue.Queue(-1)
+for _handler in _root_logger.handlers[:]:
+    _root_logger.removeHandler(_handler)
+_root_logger.addHandler(QueueHandler(_log_queue))
+_root_logger.setLevel(logging.INFO)
+_log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
+# One chat model for the orchestrator, reused by every graph built in this process
+_LLM = ChatOpenAI(model="gpt-4o", temperature=0)
+
 # Custom append function for merging lists
 def append(left: Optional[List] = None, right: Optional[List] = None):
     if left is None:
@@ -42,19 +59,14 @@ def create_graph() -> StateGraph:
     logger.info("Creating LangGraph workflow for DeepSeek reasoning")
     
     graph = StateGraph(State)
-    graph.add_node(Orchestrator.name, Orchestrator(llm=ChatOpenAI(model="gpt-4o", temperature=0)))
+    graph.add_node(Orchestrator.name, Orchestrator(llm=_LLM))
     graph.add_node("orchestrator_action", orchestrator_action)
     
-    # Create the ReasoningOrchestrator with the specified number of agents
-    reasoning_orchestrator = ReasoningOrchestrator()
-    graph.add_node(ReasoningOrchestrator.name, reasoning_orchestrator)
+    # The ReasoningOrchestrator is the single parallel node: it fans companies out to
+    # its agents on a thread pool, and only creates them the first time it runs
+    graph.add_node(ReasoningOrchestrator.name, ReasoningOrchestrator())
     graph.add_node('reasoning_completion', reasoning_completion)
-    
-    # Add each reasoning agent to the graph
-    for i, ra in enumerate(reasoning_orchestrator.agents):
-        graph.add_node(f'reasoning{i}', ra)
-        graph.add_edge(ReasoningOrchestrator.name, f'reasoning{i}')
-        graph.add_edge(f'reasoning{i}', 'reasoning_completion')
+    graph.add_edge(ReasoningOrchestrator.name, 'reasoning_completion')
     
     graph.add_edge("orchestrator_action", Orchestrator.name)
     graph.add_conditional_edges(
@@ -63,7 +75,7 @@ def create_graph() -> StateGraph:
     )
     graph.set_entry_point(Orchestrator.name)
     
-    logger.info(f"Graph created with {len(reasoning_orchestrator.agents)} reasoning agents")
+    logger.info(f"Graph created for {NUM_REASONING_AGENTS} reasoning agents")
     return graph
 
 # Create and compile the graph for use
@@ -72,7 +84,6 @@ memory = MemorySaver()
 workflow = graph.compile(checkpointer=memory)
 
 async def run_interactive(app):
-    from langchain_core.messages import AIMessageChunk, HumanMessage
     config = {"configurable": {"thread_id": 1}}
     _user_input = input("User: ")
 
@@ -91,12 +102,10 @@ async def process_documents():
     """
     logger.info("Starting document processing with LangGraph workflow")
     
-    # Initial state with instruction to process documents
+    # Initial state with instruction to process documents. The message is built per
+    # run because add_messages assigns it an id, which must not carry over between runs.
     initial_state = {
-        "messages": [{
-            "role": "user", 
-            "content": "Process all company documents from S3."
-        }],
+        "messages": [HumanMessage(content="Process all company documents from S3.")],
         "sector": REASONING_CONFIG["default_values"]["sector"],
         "check_size": REASONING_CONFIG["default_values"]["check_size"],
         "geographical_location": REASONING_CONFIG["default_values"]["geographical_location"],
@@ -106,7 +115,7 @@ async def process_documents():
     
     # Run the workflow with this initial state
     config = {"configurable": {"thread_id": 2}}
-    result = workflow.invoke(initial_state, config=config)
+    result = await workflow.ainvoke(initial_state, config=config)
     
     logger.info("Document processing workflow completed")
     
@@ -139,11 +148,9 @@ if __name__ == "__main__":
         # Run in document processing mode
         asyncio.run(process_documents())
     elif args.interactive:
-        # Run in interactive mode
-        graph = create_graph() 
-        memory = MemorySaver()
-        app = graph.compile(checkpointer=memory)
-        asyncio.run(run_interactive(app))
+        # Run in interactive mode on the workflow compiled at import; its reasoning
+        # agents are only created if a conversation asks to process documents
+        asyncio.run(run_interactive(workflow))
     else:
         # Default to document processing
         print("No mode specified, defaulting to document processing.")
@@ -1,14 +1,30 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
+import asyncio
 import json
 import os
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
 from backend.websocket import websocket_endpoint
+from backend.static_files import PrecompressedStaticFiles
+from backend.aws.s3 import get_async_s3_client, close_async_s3_client, close_s3_client
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the async S3 client once so request handlers can await S3 reads
+    if os.environ.get("AWS_S3_BUCKET_NAME"):
+        await get_async_s3_client().open()
+    # Gzip the frontend's text assets into memory before serving; dist is never written
+    if frontend_static_files is not None:
+        await asyncio.to_thread(frontend_static_files.compress_assets)
+    yield
+    await close_async_s3_client()
+    close_s3_client()
 
 # Initialize FastAPI application
-app = FastAPI(title="QuickChat API", description="WebSocket API for QuickChat")
+app = FastAPI(title="QuickChat API", description="WebSocket API for QuickChat", lifespan=lifespan)
 
 # Add CORS middleware to allow the frontend to connect
 app.add_middleware(
@@ -25,29 +41,39 @@ async def chat_endpoint(websocket: WebSocket):
     await websocket_endpoint(websocket)
 
 # Mount the static files (built frontend)
-# Get the absolute path of the frontend dist directory relative to either the
-# current directory when running as a module or from backend directory
-current_file = Path(__file__).resolve()
-if current_file.parent.name == 'backend':
-    # Running from backend directory
-    frontend_dist_path = current_file.parent.parent / "frontend" / "dist"
-else:
+@lru_cache(maxsize=1)
+def get_frontend_dist_path() -> Path:
+    """
+    Get the absolute path of the frontend dist directory relative to either the
+    current directory when running as a module or from backend directory.
+    """
+    current_file = Path(__file__).resolve()
+    if current_file.parent.name == 'backend':
+        # Running from backend directory
+        return current_file.parent.parent / "frontend" / "dist"
     # Running as a module from root
-    frontend_dist_path = Path("frontend/dist").resolve()
+    return Path("frontend/dist").resolve()
+
+frontend_dist_path = get_frontend_dist_path()
+
+frontend_static_files = None
 
 if frontend_dist_path.exists():
     print(f"Frontend dist path found at: {frontend_dist_path}")
-    # Mount the assets directory for JS/CSS files
-    app.mount("/assets", StaticFiles(directory=str(frontend_dist_path / "assets")), name="assets")
-    # Mount the dist directory at root
-    app.mount("/", StaticFiles(directory=str(frontend_dist_path), html=True), name="static")
+    # Mount the dist directory at root; this also serves the JS/CSS under /assets,
+    # with text files gzipped once at startup rather than per request
+    frontend_static_files = PrecompressedStaticFiles(directory=str(frontend_dist_path), html=True)
+    app.mount("/", frontend_static_files, name="static")
     print("Frontend files mounted successfully")
 else:
     print(f"Frontend dist path not found at: {frontend_dist_path}")
+    # The error page never changes, so one response is built and returned for every request
+    _FRONTEND_MISSING_RESPONSE = HTMLResponse(content="<html><body><h1>QuickChat API is running but the frontend build is not available. Run 'pnpm build' in the frontend directory.</h1></body></html>")
+    
     # Add a root route to display an error message if frontend is not available
     @app.get("/", response_class=HTMLResponse)
     async def get_root(request: Request):
-        return HTMLResponse(content="<html><body><h1>QuickChat API is running but the frontend build is not available. Run 'pnpm build' in the frontend directory.</h1></body></html>")
+        return _FRONTEND_MISSING_RESPONSE
 
 # If this file is run directly, start the server
 if __name__ == "__main__":
@@ -55,4 +81,7 @@ if __name__ == "__main__":
     # Get port from environment variable or use default 8080
     port = int(os.environ.get("PORT", 8080))
     print(f"Starting server on port {port}")
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True) 
\ No newline at end of file
+    # uvloop and httptools (installed with uvicorn[standard]) are requested explicitly so a
+    # missing extra fails loudly instead of silently falling back to the slower defaults
+    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True,
+                loop="uvloop", http="httptools", ws="websockets") 
\ No newline at end of file
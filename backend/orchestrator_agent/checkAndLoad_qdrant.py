@@ -2,8 +2,12 @@ from qdrant_client import QdrantClient
 from qdrant_client.http.models import Distance, VectorParams
 from langchain_openai import OpenAIEmbeddings
 from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_qdrant import QdrantVectorStore
 import os
+import hashlib
+from pathlib import Path
+import numpy as np
 from dotenv import load_dotenv 
 
 # Load environment variables
@@ -14,13 +18,68 @@ QDRANT_URL = "https://2c294842-b54a-4b7e-98e2-cc510d63dda5.us-east-1-0.aws.cloud
 QDRANT_API_KEY = os.getenv("QDRANT_API")
 COLLECTION_NAME = "MA_Agent"
 
+# Documents embedded and upserted per request when uploading
+UPLOAD_BATCH_SIZE = 256
+
+# Query embeddings are cached on disk so re-runs skip the embeddings API
+EMBED_CACHE_DIR = Path(__file__).resolve().parent / ".embed_cache"
+
+def header_value(content, header):
+    """
+    Return the stripped text after the first occurrence of a header up to the end of
+    its line (or a repeated header), or None if the header is missing.
+    """
+    start = content.find(header)
+    if start < 0:
+        return None
+    start += len(header)
+    end = content.find("\n", start)
+    line = content[start:end] if end >= 0 else content[start:]
+    return line.partition(header)[0].strip()
+
+def cached_query_embedding(embeddings, query):
+    """
+    Embed a query, reusing the vector saved by an earlier run with the same model.
+    """
+    key = hashlib.blake2b(f"{embeddings.model}:{query}".encode("utf-8")).hexdigest()
+    cache_file = EMBED_CACHE_DIR / f"{key}.npy"
+    if cache_file.exists():
+        return np.load(cache_file).tolist()
+    
+    vector = embeddings.embed_query(query)
+    EMBED_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    np.save(cache_file, np.asarray(vector, dtype=np.float32))
+    return vector
+
+def existing_content_hashes(client, collection_name):
+    """
+    Collect the content hashes stored with documents uploaded by earlier runs.
+    """
+    hashes = set()
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection_name,
+            limit=1000,
+            offset=offset,
+            with_payload=["metadata.content_hash"],
+            with_vectors=False
+        )
+        for point in points:
+            content_hash = (point.payload or {}).get("metadata", {}).get("content_hash")
+            if content_hash:
+                hashes.add(content_hash)
+        if offset is None:
+            return hashes
+
 print(f"Using URL: {QDRANT_URL}")
 print(f"API Key loaded: {'Yes' if QDRANT_API_KEY else 'No'}")
 print(f"API Key (first few chars): {QDRANT_API_KEY[:10]}..." if QDRANT_API_KEY else "API Key not found")
 
 # Initialize client
 try:
-    client = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
+    # gRPC (port 6334 on Qdrant Cloud) decodes responses from protobuf instead of JSON
+    client = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY, prefer_grpc=True, grpc_port=6334)
     print("Successfully connected to Qdrant")
     
     # List collections
@@ -46,6 +105,13 @@ try:
 
     # Initialize embeddings
     embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+    
+    # Splitter for large files, created once and reused for every file
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=4000,
+        chunk_overlap=200,
+        separators=["\n\n", "\n", " ", ""]
+    )
 
     # Process and upload the Branford Castle documents
     file_paths = [
@@ -59,6 +125,10 @@ try:
         "/Users/lisun/Library/CloudStorage/GoogleDrive-lisun08@gmail.com/My Drive/AgentPE/Scraped_Buyers/data/Batch1/branfordcastle.com/team.txt"
     ]
 
+    # Files whose content is already in the collection are not embedded again
+    existing_hashes = existing_content_hashes(client, COLLECTION_NAME)
+    print(f"Found {len(existing_hashes)} content hashes from previous uploads")
+
     # Check if files exist
     documents = []
     for file_path in file_paths:
@@ -67,60 +137,39 @@ try:
             with open(file_path, 'r', encoding='utf-8') as file:
                 content = file.read()
                 
-            # Extract metadata
-            url = None
-            title = None
-            if "URL:" in content:
-                url_line = content.split("URL:")[1].split("\n")[0].strip()
-                url = url_line
-            
-            if "TITLE:" in content:
-                title_line = content.split("TITLE:")[1].split("\n")[0].strip()
-                title = title_line
+            # Extract metadata; each header is located with find and only its value is sliced out
+            url = header_value(content, "URL:")
+            title = header_value(content, "TITLE:")
             
-            if "BASE CONTENT:" in content:
-                base_content = content.split("BASE CONTENT:")[1].strip()
+            _, found, rest = content.partition("BASE CONTENT:")
+            if found:
+                # A repeated header ends the content, as it did with split()[1]
+                base_content = rest.partition("BASE CONTENT:")[0].strip()
             else:
                 base_content = content
             
+            content_hash = hashlib.blake2b(base_content.encode("utf-8")).hexdigest()
+            if content_hash in existing_hashes:
+                print(f"Skipping unchanged file: {file_path}")
+                continue
+            
             # Create metadata
             metadata = {
                 "source": str(file_path),
                 "url": url,
                 "title": title,
-                "company": "branfordcastle.com"
+                "company": "branfordcastle.com",
+                "content_hash": content_hash
             }
             
             # For large files like media-coverage.txt, split into chunks
             if len(base_content) > 8000:  # If content is large
                 print(f"Chunking large file: {file_path}")
-                # Split by paragraphs or sections
-                chunks = []
-                lines = base_content.split('\n')
-                current_chunk = []
-                current_length = 0
-                
-                for line in lines:
-                    if current_length + len(line) > 4000 and current_length > 0:
-                        # Create a document from the current chunk
-                        chunk_content = '\n'.join(current_chunk)
-                        chunk_metadata = metadata.copy()
-                        chunk_metadata["chunk"] = len(chunks) + 1
-                        chunks.append(Document(page_content=chunk_content, metadata=chunk_metadata))
-                        
-                        # Start a new chunk
-                        current_chunk = [line]
-                        current_length = len(line)
-                    else:
-                        current_chunk.append(line)
-                        current_length += len(line)
-                
-                # Add the last chunk if it's not empty
-                if current_chunk:
-                    chunk_content = '\n'.join(current_chunk)
-                    chunk_metadata = metadata.copy()
-                    chunk_metadata["chunk"] = len(chunks) + 1
-                    chunks.append(Document(page_content=chunk_content, metadata=chunk_metadata))
+                # Split by paragraphs, then lines and words, into overlapping chunks
+                chunks = [
+                    Document(page_content=chunk_content, metadata=metadata | {"chunk": i + 1})
+                    for i, chunk_content in enumerate(text_splitter.split_text(base_content))
+                ]
                 
                 documents.extend(chunks)
                 print(f"Created {len(chunks)} chunks from {file_path}")
@@ -140,7 +189,8 @@ try:
                 collection_name=COLLECTION_NAME,
                 embedding=embeddings
             )
-            vector_store.add_documents(documents)
+            # One embedding request and one upsert per batch of documents
+            vector_store.add_documents(documents, batch_size=UPLOAD_BATCH_SIZE)
             print("Documents uploaded successfully.")
         except TypeError as e:
             print(f"Error with first method: {e}")
@@ -152,13 +202,13 @@ try:
                     collection_name=COLLECTION_NAME,
                     embeddings=embeddings
                 )
-                vector_store.add_documents(documents)
+                vector_store.add_documents(documents, batch_size=UPLOAD_BATCH_SIZE)
                 print("Documents uploaded successfully with alternative method.")
             except Exception as e2:
                 print(f"Error with alternative method: {e2}")
 
     # 4. Try a direct search
-    query_vector = embeddings.embed_query("Branford Castle acquisition criteria")
+    query_vector = cached_query_embedding(embeddings, "Branford Castle acquisition criteria")
 
     search_results = client.search(
         collection_name=COLLECTION_NAME,
@@ -1,8 +1,9 @@
 import os
 import sys
 import logging
-import json
+import orjson
 import concurrent.futures
+from functools import cached_property, lru_cache
 from pathlib import Path
 import boto3
 from datetime import datetime
@@ -177,6 +178,20 @@ def clean_output_format(text):
     
     return cleaned_text
 
+@lru_cache(maxsize=None)
+def get_deepseek_client(api_key):
+    """
+    Return the OpenAI client for the DeepSeek API, created once per API key.
+    All reasoning agents share it, so requests reuse one connection pool.
+    """
+    from openai import OpenAI
+    
+    # Initialize client with DeepSeek API base URL
+    return OpenAI(
+        api_key=api_key,
+        base_url="https://api.deepseek.com"
+    )
+
 class DeepSeekReasoner:
     """
     A wrapper class for the DeepSeek Reasoning API.
@@ -196,13 +211,7 @@ class DeepSeekReasoner:
         Captures both reasoning_content (Chain of Thought) and the final content.
         """
         try:
-            from openai import OpenAI
-            
-            # Initialize client with DeepSeek API base URL
-            client = OpenAI(
-                api_key=self.api_key,
-                base_url="https://api.deepseek.com"
-            )
+            client = get_deepseek_client(self.api_key)
             
             # Create the completion request
             response = client.chat.completions.create(
@@ -436,10 +445,14 @@ class ReasoningOrchestrator:
     description = "Orchestrate multiple reasoning agents to process company files in parallel."
     
     def __init__(self, llm: Optional[Runnable] = None):
-        # Create agents
-        self.agents = [Reasoning(agent_id=i) for i in range(NUM_REASONING_AGENTS)]
-        
-        logger.info(f"Initialized ReasoningOrchestrator with {len(self.agents)} agents")
+        logger.info(f"Initialized ReasoningOrchestrator for {NUM_REASONING_AGENTS} agents")
+    
+    @cached_property
+    def agents(self) -> List["Reasoning"]:
+        """Reasoning agents, created on the first run rather than when the graph is built."""
+        agents = [Reasoning(agent_id=i) for i in range(NUM_REASONING_AGENTS)]
+        logger.info(f"Created {len(agents)} reasoning agents")
+        return agents
     
     def __call__(self, urls: Optional[List[str]] = None, **kwargs):
         return self._run(urls)
@@ -585,8 +598,10 @@ def reasoning_completion(state: Dict[str, Any]) -> Dict[str, Any]:
     summary_file = output_dir / f"reasoning_summary_{timestamp}.json"
     
     try:
-        with open(summary_file, "w") as f:
-            json.dump(state, f, indent=2, default=str)
+        # default=str covers message objects and anything else orjson can't serialize natively
+        summary_file.write_bytes(orjson.dumps(
+            state, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ))
         
         logger.info(f"Saved reasoning summary to {summary_file}")
     except Exception as e:
@@ -0,0 +1,147 @@
+"""
+Static file serving for the built frontend.
+
+Text assets are gzipped into memory once when the app starts (see
+PrecompressedStaticFiles.compress_assets) and the compressed bytes are served
+to clients that accept gzip, so no request pays for compression and the build
+directory is never written to.
+"""
+
+import gzip
+import hashlib
+import os
+from email.utils import formatdate
+from mimetypes import guess_type
+from typing import Dict, NamedTuple, Optional
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# Text assets worth compressing; images and fonts are already compressed
+_COMPRESSIBLE_SUFFIXES = (".js", ".css", ".html", ".svg", ".json", ".map", ".txt")
+
+
+class CompressedAsset(NamedTuple):
+    """Gzipped copy of a static file and the source stat it was built from."""
+    body: bytes
+    etag: str
+    mtime: float
+    size: int
+
+
+def gzip_assets(directory) -> Dict[str, CompressedAsset]:
+    """
+    Gzip every compressible file under a directory into memory.
+
+    Args:
+        directory: Directory of static files
+
+    Returns:
+        Dictionary mapping each source file's real path to its compressed copy
+    """
+    compressed = {}
+    for root, _, filenames in os.walk(os.path.realpath(directory)):
+        for filename in filenames:
+            if not filename.endswith(_COMPRESSIBLE_SUFFIXES):
+                continue
+            source = os.path.join(root, filename)
+            try:
+                stat_result = os.stat(source)
+                with open(source, "rb") as f:
+                    body = gzip.compress(f.read(), compresslevel=9, mtime=0)
+            except OSError as e:
+                # An unreadable file is just served uncompressed
+                print(f"Could not compress {source}: {e}")
+                continue
+            etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+            compressed[source] = CompressedAsset(body, etag, stat_result.st_mtime, stat_result.st_size)
+    return compressed
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Return True if an Accept-Encoding header allows a gzip response.
+
+    Codings with q=0 are refused, and an explicit gzip entry takes precedence
+    over the '*' wildcard.
+
+    Args:
+        accept_encoding: Value of the Accept-Encoding request header
+
+    Returns:
+        True if gzip is acceptable to the client
+    """
+    gzip_q: Optional[float] = None
+    wildcard_q: Optional[float] = None
+    for entry in accept_encoding.split(","):
+        coding, _, params = entry.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding in ("gzip", "x-gzip"):
+            gzip_q = q
+        elif coding == "*":
+            wildcard_q = q
+    if gzip_q is not None:
+        return gzip_q > 0
+    return wildcard_q is not None and wildcard_q > 0
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves an in-memory gzipped copy of a file to clients accepting gzip."""
+
+    def __init__(self, *, directory, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.compressed: Dict[str, CompressedAsset] = {}
+
+    def compress_assets(self) -> None:
+        """Gzip the text assets into memory; called once from the app lifespan."""
+        self.compressed = gzip_assets(self.directory)
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        full_path = os.fspath(full_path)
+        # A leftover .gz next to an asset compressed in memory is a stale copy of that
+        # asset, not a file of its own; other .gz files in the build are served as is
+        if full_path.endswith(".gz") and full_path[:-3] in self.compressed:
+            raise HTTPException(status_code=404)
+
+        asset = self.compressed.get(full_path)
+        # Files changed since startup are served as they are on disk
+        if asset is None or (asset.mtime, asset.size) != (stat_result.st_mtime, stat_result.st_size):
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request_headers = Headers(scope=scope)
+        if not accepts_gzip(request_headers.get("accept-encoding", "")):
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            response.headers["Vary"] = "Accept-Encoding"
+            return response
+
+        response = Response(
+            asset.body,
+            status_code=status_code,
+            media_type=guess_type(full_path)[0] or "text/plain",
+            headers={
+                "Content-Encoding": "gzip",
+                "Vary": "Accept-Encoding",
+                "ETag": asset.etag,
+                "Last-Modified": formatdate(asset.mtime, usegmt=True),
+            },
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
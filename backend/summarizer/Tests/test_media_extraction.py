@@ -101,11 +101,8 @@ class MediaExtractionTester:
             self.logger.error(f"No content found in directory {directory_name}")
             return {}
         
-        # Create a dictionary mapping file paths to their contents
-        file_content_map = {}
-        for i, file_path in enumerate(file_paths):
-            if i < len(contents):
-                file_content_map[file_path] = contents[i]
+        # Create a dictionary mapping file paths to their contents, skipping failed reads
+        file_content_map = {fetch.key: fetch.content for fetch in contents if fetch.ok}
         
         # Filter for media-related files for testing
         media_files = {}
@@ -123,11 +123,8 @@ class Summarizer:
         
         self.logger.info(f"Retrieved content for {len(contents)} files")
         
-        # Step 3: Create a dictionary mapping file paths to their contents
-        file_content_map = {}
-        for i, file_path in enumerate(file_paths):
-            if i < len(contents):
-                file_content_map[file_path] = contents[i]
+        # Step 3: Create a dictionary mapping file paths to their contents, skipping failed reads
+        file_content_map = {fetch.key: fetch.content for fetch in contents if fetch.ok}
         
         # Extract firm name early
         self.current_firm_name = self._extract_firm_name(directory_name, file_content_map)
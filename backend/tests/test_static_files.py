@@ -0,0 +1,166 @@
+"""
+Test module for static file serving.
+
+This module checks Accept-Encoding parsing and that the in-memory gzip copies
+of the frontend build are served with validators, fall back to the file on
+disk when it changes, and never shadow real .gz files in the build.
+"""
+
+import unittest
+import gzip
+import os
+import sys
+import tempfile
+import logging
+from pathlib import Path
+
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Add parent directory to path so we can import the backend modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# Import the module to test
+from backend.static_files import PrecompressedStaticFiles, accepts_gzip
+
+_SCRIPT = "console.log('hello from the frontend build');\n" * 50
+
+
+class TestAcceptsGzip(unittest.TestCase):
+    """Test cases for Accept-Encoding parsing."""
+
+    def test_q_values(self):
+        """Test that q-values, the wildcard and case are honoured."""
+        cases = {
+            "gzip": True,
+            "GZIP": True,
+            "x-gzip": True,
+            "gzip, deflate, br": True,
+            "gzip;q=0.5": True,
+            "gzip; q=0.001": True,
+            "gzip;q=0": False,
+            "gzip;q=0.0, deflate": False,
+            "gzip;Q=0": False,
+            "gzip;q=abc": False,
+            "*": True,
+            "*;q=0": False,
+            "gzip;q=0, *": False,
+            "gzip, *;q=0": True,
+            "identity": False,
+            "br, deflate": False,
+            "": False,
+        }
+        for header, expected in cases.items():
+            self.assertEqual(accepts_gzip(header), expected, f"unexpected result for {header!r}")
+
+        logger.info("Successfully tested Accept-Encoding parsing")
+
+
+class TestPrecompressedStaticFiles(unittest.TestCase):
+    """Test cases for serving the in-memory gzip copies."""
+
+    def setUp(self):
+        """Set up a build directory and a client for an app serving it."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dist = Path(self._tmp.name)
+        (self.dist / "app.js").write_text(_SCRIPT)
+        (self.dist / "logo.png").write_bytes(b"\x89PNG not really")
+        self.archive = gzip.compress(b"release notes")
+        (self.dist / "notes.txt.gz").write_bytes(self.archive)
+        # A leftover copy from an older build that compresses files on disk
+        (self.dist / "app.js.gz").write_bytes(gzip.compress(b"stale"))
+
+        self.static_files = PrecompressedStaticFiles(directory=str(self.dist))
+        self.static_files.compress_assets()
+        app = Starlette(routes=[Mount("/", app=self.static_files)])
+        self.client = TestClient(app)
+        self.addCleanup(self.client.close)
+
+    def tearDown(self):
+        """Clean up the build directory."""
+        self._tmp.cleanup()
+
+    def get(self, path, accept_encoding="gzip", **headers):
+        """Request a path without letting the client decode the body."""
+        return self.client.get(path, headers={"Accept-Encoding": accept_encoding, **headers})
+
+    def test_gzip_response_has_validators(self):
+        """Test that the compressed copy carries an ETag and Last-Modified and revalidates."""
+        response = self.get("/app.js")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.headers["vary"], "Accept-Encoding")
+        self.assertEqual(response.text, _SCRIPT)
+        etag = response.headers["etag"]
+        last_modified = response.headers["last-modified"]
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+        self.assertTrue(last_modified.endswith("GMT"))
+
+        # Verify both validators produce a 304
+        self.assertEqual(self.get("/app.js", **{"If-None-Match": etag}).status_code, 304)
+        self.assertEqual(self.get("/app.js", **{"If-Modified-Since": last_modified}).status_code, 304)
+
+        logger.info("Successfully tested gzip validators")
+
+    def test_identity_when_gzip_refused(self):
+        """Test that a client refusing gzip gets the file from disk with Vary set."""
+        response = self.get("/app.js", accept_encoding="gzip;q=0, identity")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(response.headers["vary"], "Accept-Encoding")
+        self.assertEqual(response.content, _SCRIPT.encode())
+
+        logger.info("Successfully tested identity fallback")
+
+    def test_changed_file_served_from_disk(self):
+        """Test that a file edited since startup is served as it is on disk."""
+        updated = "console.log('rebuilt');\n"
+        path = self.dist / "app.js"
+        path.write_text(updated)
+        stat_result = path.stat()
+        os.utime(path, (stat_result.st_atime, stat_result.st_mtime + 10))
+
+        response = self.get("/app.js")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(response.text, updated)
+
+        logger.info("Successfully tested stale copy fallback")
+
+    def test_gz_404_only_for_compressed_names(self):
+        """Test that only .gz siblings of compressed assets are hidden."""
+        self.assertEqual(self.get("/app.js.gz").status_code, 404)
+
+        # Verify a .gz file that is part of the build is still served
+        response = self.get("/notes.txt.gz", accept_encoding="identity")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.archive)
+
+        logger.info("Successfully tested .gz handling")
+
+    def test_uncompressible_and_build_untouched(self):
+        """Test that binary assets are served as is and nothing is written to the build."""
+        before = sorted(os.listdir(self.dist))
+
+        response = self.get("/logo.png")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertNotIn(str(self.dist / "logo.png"), self.static_files.compressed)
+
+        self.get("/app.js")
+        self.assertEqual(sorted(os.listdir(self.dist)), before)
+
+        logger.info("Successfully tested uncompressed assets")
+
+
+# Run the tests if this file is executed directly
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,29 @@
 from fastapi import WebSocket, WebSocketDisconnect, HTTPException
-from typing import List, Optional
+from typing import Optional, Set
 from langchain_core.messages import HumanMessage, AIMessageChunk
 from .graph import workflow
 from .auth import decode_token, get_current_user
-import json
+import orjson
 import time
+from itertools import count
 import os
 from redis import Redis
 from redis.exceptions import ConnectionError
 import traceback
 from backend.orchestrator_agent.orchestrator import Orchestrator
 
+# Streamed message ids; seeded with the start time in ms so ids stay unique across restarts
+_message_ids = count(time.time_ns() // 1_000_000)
+
+async def send_json(websocket: WebSocket, message: dict):
+    """Send a message as a JSON text frame, serialized with orjson"""
+    # Text frames, not bytes: the frontend JSON.parses event.data as a string
+    await websocket.send_text(orjson.dumps(message).decode())
+
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        # A set gives O(1) membership and removal; WebSocket hashes by identity
+        self.active_connections: Set[WebSocket] = set()
         self.connection_tokens: dict[WebSocket, str] = {}
         
         # Try to connect to Redis if URL is provided
@@ -36,7 +46,7 @@ class ConnectionManager:
                 self.redis.hset("ws_tokens", connection_id, token)
             self.redis.sadd("ws_connections", connection_id)
         else:
-            self.active_connections.append(websocket)
+            self.active_connections.add(websocket)
             if token:
                 self.connection_tokens[websocket] = token
 
@@ -47,10 +57,8 @@ class ConnectionManager:
             self.redis.hdel("ws_tokens", connection_id)
             self.redis.srem("ws_connections", connection_id)
         else:
-            if websocket in self.active_connections:
-                self.active_connections.remove(websocket)
-            if websocket in self.connection_tokens:
-                del self.connection_tokens[websocket]
+            self.active_connections.discard(websocket)
+            self.connection_tokens.pop(websocket, None)
 
     def get_token(self, websocket: WebSocket) -> Optional[str]:
         connection_id = str(id(websocket))
@@ -60,7 +68,7 @@ class ConnectionManager:
         return self.connection_tokens.get(websocket)
 
     async def send_message(self, message: str, websocket: WebSocket, message_type: str = "message"):
-        await websocket.send_json({
+        await send_json(websocket, {
             "type": message_type,
             "content": message,
             "sender": "assistant"
@@ -99,11 +107,11 @@ async def handle_chat(websocket: WebSocket, user_message: str, message_type: str
     
     try:
         # First try to parse the entire received message
-        data = json.loads(user_message)
+        data = orjson.loads(user_message)
         if isinstance(data, dict):
             if data.get("type") == "message" and data.get("content"):
                 # This is a standard WebSocket message format
-                msg_data = json.loads(data.get("content", "{}"))
+                msg_data = orjson.loads(data.get("content", "{}"))
                 if isinstance(msg_data, dict):
                     # Extract content and parameters
                     user_content = msg_data.get("content", user_message)
@@ -121,7 +129,7 @@ async def handle_chat(websocket: WebSocket, user_message: str, message_type: str
                 current_sector = data.get("sector", sector)
                 current_check_size = data.get("check_size", check_size)
                 current_geo_location = data.get("geographical_location", geographical_location)
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         # Not a JSON, use as is
         pass
     
@@ -176,7 +184,7 @@ async def handle_chat(websocket: WebSocket, user_message: str, message_type: str
             print(f"DEBUG - Final state after initialization: {final_state}")
             
             # Send a silent acknowledgment
-            await websocket.send_json({
+            await send_json(websocket, {
                 "type": "system_message",
                 "content": "Initialization complete",
                 "sender": "system"
@@ -184,7 +192,7 @@ async def handle_chat(websocket: WebSocket, user_message: str, message_type: str
             return
             
         # For regular messages, handle streaming as usual
-        message_id = str(int(time.time() * 1000))
+        message_id = str(next(_message_ids))
         first_chunk = True
         chunks_received = 0
         
@@ -192,7 +200,7 @@ async def handle_chat(websocket: WebSocket, user_message: str, message_type: str
             if isinstance(message, AIMessageChunk) and metadata["langgraph_node"] == Orchestrator.name:
                 chunks_received += 1
                 if first_chunk:
-                    await websocket.send_json({
+                    await send_json(websocket, {
                         "type": "stream_start",
                         "message_id": message_id,
                         "content": message.content,
@@ -200,7 +208,7 @@ async def handle_chat(websocket: WebSocket, user_message: str, message_type: str
                     })
                     first_chunk = False
                 else:
-                    await websocket.send_json({
+                    await send_json(websocket, {
                         "type": "stream_chunk",
                         "message_id": message_id,
                         "content": message.content,
@@ -215,13 +223,13 @@ async def handle_chat(websocket: WebSocket, user_message: str, message_type: str
         print(f"DEBUG - Final state after processing: {final_state}")
         
         if chunks_received == 0:
-            await websocket.send_json({
+            await send_json(websocket, {
                 "type": "message",
                 "content": "I'm processing your request. Please let me know if you have any questions.",
                 "sender": "assistant"
             })
         else:
-            await websocket.send_json({
+            await send_json(websocket, {
                 "type": "stream_end",
                 "message_id": message_id,
                 "sender": "assistant"
@@ -229,7 +237,7 @@ async def handle_chat(websocket: WebSocket, user_message: str, message_type: str
     except Exception as e:
         print(f"Error in handle_chat: {str(e)}")
         print(f"DEBUG - Exception traceback: {traceback.format_exc()}")
-        await websocket.send_json({
+        await send_json(websocket, {
             "type": "message",
             "content": "I apologize, but I'm having trouble processing your request. Could you please try again?",
             "sender": "assistant"
@@ -248,7 +256,7 @@ async def websocket_endpoint(websocket: WebSocket):
         while True:
             try:
                 message = await websocket.receive_text()
-                data = json.loads(message)
+                data = orjson.loads(message)
                 
                 # Handle authentication message
                 if not authenticated and data.get("type") == "auth":
@@ -257,11 +265,11 @@ async def websocket_endpoint(websocket: WebSocket):
                     if token == "test":
                         authenticated = True
                         manager.connection_tokens[websocket] = "test"
-                        await websocket.send_json({
+                        await send_json(websocket, {
                             "type": "auth_success",
                             "sender": "system"
                         })
-                        await websocket.send_json({
+                        await send_json(websocket, {
                             "type": "greeting",
                             "content": "Hello! How can I help you today?",
                             "sender": "assistant"
@@ -279,11 +287,11 @@ async def websocket_endpoint(websocket: WebSocket):
                         
                         authenticated = True
                         manager.connection_tokens[websocket] = token
-                        await websocket.send_json({
+                        await send_json(websocket, {
                             "type": "auth_success",
                             "sender": "system"
                         })
-                        await websocket.send_json({
+                        await send_json(websocket, {
                             "type": "greeting",
                             "content": "Hello! How can I help you today?",
                             "sender": "assistant"
@@ -322,7 +330,7 @@ async def websocket_endpoint(websocket: WebSocket):
                 # Pass the stored parameters to handle_chat
                 await handle_chat(websocket, message, sector=sector, check_size=check_size, geographical_location=geographical_location)
                 
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 if not authenticated:
                     await websocket.close(code=4001)
                     return